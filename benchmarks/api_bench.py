@@ -0,0 +1,182 @@
+"""petsinfra.api 처리량 벤치마크 (requests/sec).
+
+    python -m benchmarks.api_bench                                   # 새 API 서버를 띄워 측정
+    python -m benchmarks.api_bench --clients 1 8 32 --duration 5 --output api.json
+    python -m benchmarks.api_bench --url http://127.0.0.1:8502       # 이미 실행 중인 서버
+
+시나리오마다 clients 개 스레드가 duration 초 동안 같은 요청을 반복해 보내고, 처리량(요청/초),
+지연 시간 p50/p95/p99, 응답 크기, 상태 코드별 횟수를 잰다. 시나리오는 자치구 지표(JSON/Arrow),
+자치구 × 카테고리 시설 수, 구별 시설 목록(JSON/Arrow/gzip), 영업 중 필터, 주변 시설 검색,
+ETag 재검증(If-None-Match → 304)이다. 측정 전에 시나리오마다 한 번씩 요청해 캐시를 채운다.
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from benchmarks.load_test import _free_port, _percentiles, server_rss_mb
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ARROW = {'Accept': 'application/vnd.apache.arrow.stream'}
+GZIP = {'Accept-Encoding': 'gzip'}
+
+# 이름 -> (경로, 인자, 헤더)
+SCENARIOS = {
+    'districts.json': ('/api/districts', {}, {}),
+    'districts.arrow': ('/api/districts', {}, ARROW),
+    'categories.json': ('/api/districts/categories', {'level': '카테고리3'}, {}),
+    'facilities.json': ('/api/facilities', {'gu': '강남구', 'limit': 1000}, {}),
+    'facilities.gzip': ('/api/facilities', {'gu': '강남구', 'limit': 1000}, GZIP),
+    'facilities.arrow': ('/api/facilities', {'gu': '강남구', 'limit': 1000}, ARROW),
+    'facilities.open_now': ('/api/facilities', {'gu': '강남구', 'open_now': 1, 'limit': 1000}, {}),
+    'facilities.search': ('/api/facilities', {'q': '동물병원', 'category2': '반려의료'}, {}),
+    'near.k20': ('/api/facilities/near', {'lat': 37.4979, 'lon': 127.0276, 'k': 20}, {}),
+    'districts.etag': ('/api/districts', {}, None),  # 처음 받은 ETag 로 재검증
+    'facilities.etag': ('/api/facilities', {'gu': '강남구', 'limit': 1000}, None),
+}
+
+
+def start_server(port, env=None):
+    """python -m petsinfra.api 를 띄우고 /api/version 응답을 기다린다."""
+    import subprocess
+
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'petsinfra.api', '--port', str(port)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"API 서버가 종료되었습니다 (코드 {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/version', timeout=1) as response:
+                if response.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("API 서버가 응답하지 않습니다")
+
+
+def _request(host, port, target, headers):
+    """요청 하나를 보내고 (상태 코드, 응답 헤더, 본문 크기)를 반환한다."""
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        connection.request('GET', target, headers=headers)
+        response = connection.getresponse()
+        size = len(response.read())
+        return response.status, response.headers, size
+    finally:
+        connection.close()
+
+
+def run_scenario(url, name, clients, duration_s):
+    path, params, headers = SCENARIOS[name]
+    parsed = urllib.parse.urlsplit(url)
+    host, port = parsed.hostname, parsed.port or 80
+    target = path + ('?' + urllib.parse.urlencode(params, doseq=True) if params else '')
+
+    # 캐시를 채우고, 재검증 시나리오는 받은 ETag 를 이후 요청에 싣는다
+    status, response_headers, _ = _request(host, port, target, headers or {})
+    if status != 200:
+        raise RuntimeError(f"{name}: {target} 응답 {status}")
+    if headers is None:
+        headers = {'If-None-Match': response_headers['ETag']}
+
+    latencies, sizes, statuses = [], [], {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration_s
+
+    def worker():
+        local_latencies, local_sizes, local_statuses = [], [], {}
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, _, size = _request(host, port, target, headers)
+            local_latencies.append(time.perf_counter() - start)
+            local_sizes.append(size)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        with lock:
+            latencies.extend(local_latencies)
+            sizes.extend(local_sizes)
+            for status, n in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + n
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_s = time.perf_counter() - start
+
+    return {
+        'scenario': name,
+        'target': target,
+        'clients': clients,
+        'requests': len(latencies),
+        'requests_per_s': len(latencies) / wall_s if wall_s else None,
+        'latency': _percentiles(latencies),
+        'mean_bytes': sum(sizes) / len(sizes) if sizes else 0,
+        'statuses': {str(status): n for status, n in sorted(statuses.items())},
+    }
+
+
+def _print_result(result):
+    latency = result['latency']
+    print(f"{result['scenario']:<20} 클라이언트 {result['clients']:>3}: {result['requests_per_s']:8.1f} req/s, "
+          f"p50 {latency['p50_s'] * 1000:6.1f} ms, p99 {latency['p99_s'] * 1000:6.1f} ms, "
+          f"{result['mean_bytes'] / 1024:7.1f} KB, {result['statuses']}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 8], help='동시 클라이언트 수 (단계별)')
+    parser.add_argument('--duration', type=float, default=3.0, help='시나리오마다 측정 시간(초)')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--url', help='이미 실행 중인 API 서버 주소 (기본: 새 서버를 띄움)')
+    parser.add_argument('--pid', type=int, help='--url 서버의 프로세스 id (RSS 측정용)')
+    parser.add_argument('--output', help='결과 JSON 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    proc = None
+    url, pid = args.url, args.pid
+    if url is None:
+        port = _free_port()
+        proc = start_server(port, env)
+        url, pid = f'http://127.0.0.1:{port}', proc.pid
+    try:
+        report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'resource_dir': env.get('PETSINFRA_RESOURCE_DIR'),
+            'url': url,
+            'duration_s': args.duration,
+            'results': [],
+        }
+        for clients in args.clients:
+            for name in args.scenarios:
+                result = run_scenario(url, name, clients, args.duration)
+                _print_result(result)
+                report['results'].append(result)
+        report['rss_mb'] = server_rss_mb(pid)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""streamlt.py 성능 벤치마크.
+
+    python -m benchmarks.bench_app                      # 원본 데이터
+    python -m benchmarks.bench_app --scale 1 10 100     # 시설 수 10배, 100배 합성 데이터 포함
+    python -m benchmarks.bench_app --build --output bench.json
+    python -m benchmarks.bench_app --compare old.json new.json
+
+측정 항목 (배율마다 새 프로세스에서 측정):
+  - 무거운 의존성 import 시간, 첫 페이지(EDA) 첫 실행 시간 (cold start)
+  - 페이지(EDA, 시연, 데이터)별 첫 실행 / 재실행(rerun) 시간
+  - EDA 의 3D 토글, 시연의 구 선택(selectbox)마다 rerun 시간
+  - 각 plotly_chart / pydeck_chart 의 직렬화된 크기(bytes)
+  - 프로세스 최대 RSS
+
+streamlit.testing.v1.AppTest 로 스크립트를 실행하며, 사이드바 option_menu 는 커스텀
+컴포넌트라 AppTest 에서 클릭할 수 없으므로 반환값을 바꿔 페이지를 고른다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / 'streamlt.py'
+PAGES = ['EDA', '시연', '데이터']
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _summary(samples):
+    samples = sorted(samples)
+    return {
+        'n': len(samples),
+        'median_s': statistics.median(samples),
+        'p95_s': samples[min(len(samples) - 1, round(0.95 * (len(samples) - 1)))],
+        'max_s': samples[-1],
+    }
+
+
+def payload_bytes(at):
+    """현재 화면에 그려진 차트별 직렬화 크기."""
+    charts = []
+    for element in at.get('plotly_chart'):
+        charts.append({'type': 'plotly_chart', 'bytes': len(element.proto.spec.encode())})
+    for element in at.get('deck_gl_json_chart'):
+        charts.append({'type': 'pydeck_chart', 'bytes': len(element.proto.json.encode())})
+    return charts
+
+
+def _check(at):
+    if at.exception:
+        raise RuntimeError(f"앱 실행 중 예외: {[e.value for e in at.exception]}")
+    return at
+
+
+def run_worker(repeat):
+    """현재 프로세스에서 측정하고 결과를 dict 로 반환한다."""
+    import resource
+
+    start = time.perf_counter()
+    import geopandas  # noqa: F401
+    import plotly.express  # noqa: F401
+    import pydeck  # noqa: F401
+    import streamlit  # noqa: F401
+    import_s = time.perf_counter() - start
+
+    sys.path.insert(0, str(ROOT))
+    import streamlit_option_menu
+    from streamlit.testing.v1 import AppTest
+
+    def open_page(page):
+        streamlit_option_menu.option_menu = lambda *args, **kwargs: page
+        return AppTest.from_file(str(APP_PATH), default_timeout=600)
+
+    result = {'import_s': import_s, 'pages': {}}
+    for page in PAGES:
+        at = open_page(page)
+        first_s = _timed(lambda: _check(at.run()))
+        rerun = [_timed(lambda: _check(at.run())) for _ in range(repeat)]
+        page_result = {'first_run_s': first_s, 'rerun': _summary(rerun), 'charts': payload_bytes(at)}
+
+        if page == 'EDA':
+            toggles = {}
+            for i in range(len(at.toggle)):
+                samples = []
+                for _ in range(repeat):
+                    samples.append(_timed(lambda: _check(at.toggle[i].set_value(True).run())))
+                    samples.append(_timed(lambda: _check(at.toggle[i].set_value(False).run())))
+                toggles[at.toggle[i].label] = _summary(samples)
+            page_result['toggles'] = toggles
+
+        if page == '시연':
+            districts = {}
+            for gu in [option for option in at.selectbox[0].options if option != 'None']:
+                elapsed = _timed(lambda: _check(at.selectbox[0].select(gu).run()))
+                districts[gu] = {'rerun_s': elapsed, 'charts': payload_bytes(at)}
+            page_result['districts'] = districts
+            page_result['district_rerun'] = _summary([d['rerun_s'] for d in districts.values()])
+
+        result['pages'][page] = page_result
+
+    result['cold_start_s'] = import_s + result['pages']['EDA']['first_run_s']
+    # Linux 에서 ru_maxrss 단위는 KB
+    result['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def run_scale(scale, repeat, build):
+    """배율 하나를 새 프로세스에서 측정한다."""
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as tmp:
+        if scale != 1:
+            from benchmarks.synthetic import write_scaled_resources
+            env['PETSINFRA_RESOURCE_DIR'] = str(write_scaled_resources(tmp, scale))
+        if build:
+            subprocess.run([sys.executable, '-m', 'petsinfra.build'], cwd=ROOT, env=env,
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        proc = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_app', '--worker', '--repeat', str(repeat)],
+            cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+        )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(result, prefix=''):
+    # 비교용: 숫자 지표만 'scale/pages/EDA/rerun/median_s' 같은 경로로 펼친다
+    flat = {}
+    for key, value in result.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + '/'))
+        elif isinstance(value, list):
+            flat[path + '/bytes'] = sum(item.get('bytes', 0) for item in value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(old_path, new_path, threshold=0.1):
+    """두 결과 파일의 지표를 비교해 threshold 보다 크게 바뀐 항목을 출력한다."""
+    old = _flatten(json.loads(Path(old_path).read_text(encoding='utf-8'))['scales'])
+    new = _flatten(json.loads(Path(new_path).read_text(encoding='utf-8'))['scales'])
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        if '/districts/' in key or key.endswith('/n'):
+            continue
+        before, after = old[key], new[key]
+        change = (after - before) / before if before else 0.0
+        if abs(change) >= threshold:
+            regressions += change > 0
+            print(f"{'▲' if change > 0 else '▼'} {key}: {before:.4g} → {after:.4g} ({change:+.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, nargs='+', default=[1], help='시설 수 배율 (합성 데이터)')
+    parser.add_argument('--repeat', type=int, default=5, help='rerun 반복 횟수')
+    parser.add_argument('--build', action='store_true', help='측정 전에 python -m petsinfra.build 실행')
+    parser.add_argument('--output', help='결과 JSON 파일 (기본: 표준 출력)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='두 결과 파일 비교')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.repeat), ensure_ascii=False))
+        return
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'repeat': args.repeat,
+        'build': args.build,
+        'scales': {},
+    }
+    for scale in args.scale:
+        print(f"scale x{scale} ...", file=sys.stderr)
+        report['scales'][f"x{scale}"] = run_scale(scale, args.repeat, args.build)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+"""여러 세션을 동시에 흉내 내는 streamlt.py 부하 테스트.
+
+    python -m benchmarks.load_test                              # 1, 5, 10 세션
+    python -m benchmarks.load_test --sessions 1 10 25 --actions 40 --output load.json
+    python -m benchmarks.load_test --url http://localhost:8501 --pid 12345   # 이미 실행 중인 서버
+
+로컬 Streamlit 서버를 띄우고(또는 --url 의 서버에) 브라우저와 같은 웹소켓 프로토콜
+(/_stcore/stream, BackMsg/ForwardMsg protobuf)로 세션을 연결한다. 세션마다 무작위 클릭
+흐름(페이지 전환, EDA 의 3D 토글, 시연의 구 선택)을 생각 시간(think time)을 두고 실행하며,
+요청을 보낸 뒤 script_finished 를 받을 때까지를 재실행 시간으로 잰다.
+
+측정 항목 (--sessions 의 세션 수마다 한 단계):
+  - 재실행 시간 p50/p95/p99 (전체, 동작별), 처리량 (재실행/초), 받은 바이트 수
+  - 서버 RSS: 단계 시작 전, 모든 세션이 클릭을 마치고 연결된 상태, 세션 하나당 증가량
+  - 앱 예외(exception 요소) 수
+
+데이터와 그래프가 프로세스 캐시로 공유된다면 세션 하나당 RSS 증가량은 세션 상태와 위젯
+크기 수준이어야 한다. 첫 단계 전에 세션 하나로 모든 페이지와 구를 한 번씩 열어 캐시를 채운다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / 'streamlt.py'
+
+# 위젯 종류 -> WidgetState 에 값을 넣는 필드
+_VALUE_FIELDS = {
+    'checkbox': 'bool_value',  # st.toggle 포함
+    'selectbox': 'int_value',
+    'radio': 'int_value',
+    'component_instance': 'json_value',  # option_menu
+}
+MENU_COMPONENT = 'streamlit_option_menu.option_menu'
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {'n': 0}
+
+    def at(q):
+        return samples[min(len(samples) - 1, round(q * (len(samples) - 1)))]
+
+    return {'n': len(samples), 'p50_s': at(0.50), 'p95_s': at(0.95), 'p99_s': at(0.99), 'max_s': samples[-1]}
+
+
+def server_rss_mb(pid):
+    """프로세스의 현재 RSS (MB, Linux /proc 기준). 알 수 없으면 None."""
+    if pid is None:
+        return None
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def start_server(port, env=None):
+    """streamlt.py 를 headless 로 띄우고 health 응답을 기다린다."""
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', str(APP_PATH),
+         '--server.headless', 'true', '--server.port', str(port),
+         '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Streamlit 서버가 종료되었습니다 (코드 {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Streamlit 서버가 응답하지 않습니다")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+class Session:
+    """웹소켓으로 연결된 가상 브라우저 세션 하나."""
+
+    def __init__(self, url, seed=0):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        self._BackMsg = BackMsg
+        self._ForwardMsg = ForwardMsg
+        self._WidgetState = WidgetState
+        self.url = url.replace('http', 'ws', 1).rstrip('/') + '/_stcore/stream'
+        self.rng = random.Random(seed)
+        self.widgets = {}  # 라벨(메뉴는 컴포넌트 이름) -> (종류, 요소 proto)
+        self.states = {}  # 위젯 id -> WidgetState (사용자가 바꾼 값만)
+        self.reruns = []  # dict(action, s, bytes, errors)
+        self.page = None
+        self._ws = None
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+
+        self._ws = await websocket_connect(self.url, subprotocols=['streamlit'], max_message_size=1 << 30)
+        return await self.rerun('connect')
+
+    def close(self):
+        if self._ws is not None:
+            self._ws.close()
+
+    async def rerun(self, action):
+        """현재 위젯 상태로 재실행을 요청하고 끝날 때까지 기다린다."""
+        back = self._BackMsg()
+        back.rerun_script.widget_states.widgets.extend(self.states.values())
+        start = time.perf_counter()
+        await self._ws.write_message(back.SerializeToString(), binary=True)
+
+        widgets, received, errors = {}, 0, 0
+        finished = self._ForwardMsg.ScriptFinishedStatus
+        while True:
+            raw = await self._ws.read_message()
+            if raw is None:
+                raise ConnectionError("서버가 연결을 닫았습니다")
+            received += len(raw)
+            msg = self._ForwardMsg.FromString(raw)
+            kind = msg.WhichOneof('type')
+            if kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                element_kind = msg.delta.new_element.WhichOneof('type')
+                element = getattr(msg.delta.new_element, element_kind)
+                if element_kind == 'exception':
+                    errors += 1
+                elif element_kind == 'component_instance':
+                    widgets[element.component_name] = (element_kind, element)
+                elif element_kind in _VALUE_FIELDS:
+                    widgets[element.label] = (element_kind, element)
+            elif kind == 'script_finished' and msg.script_finished in (
+                    finished.FINISHED_SUCCESSFULLY, finished.FINISHED_WITH_COMPILE_ERROR):
+                break
+        elapsed = time.perf_counter() - start
+
+        # 브라우저처럼 이번 실행에 그려진 위젯의 상태만 남긴다
+        self.widgets = widgets
+        ids = {element.id for _, element in widgets.values()}
+        self.states = {widget_id: state for widget_id, state in self.states.items() if widget_id in ids}
+        self.reruns.append({'action': action, 's': elapsed, 'bytes': received, 'errors': errors})
+        return elapsed
+
+    def set(self, label, value):
+        kind, element = self.widgets[label]
+        state = self._WidgetState(id=element.id)
+        setattr(state, _VALUE_FIELDS[kind], json.dumps(value) if kind == 'component_instance' else value)
+        self.states[element.id] = state
+
+    def value(self, label):
+        kind, element = self.widgets[label]
+        state = self.states.get(element.id)
+        return getattr(state, _VALUE_FIELDS[kind]) if state is not None else element.default
+
+    async def open_page(self, page):
+        self.set(MENU_COMPONENT, page)
+        self.page = page
+        return await self.rerun(f'page.{page}')
+
+    def actions(self):
+        """지금 화면에서 할 수 있는 동작 목록."""
+        from petsinfra.views import PAGES
+
+        actions = [('page', page) for page in PAGES if page != self.page]
+        actions += [('toggle', label) for label in ('인구수 3D', '반려동물 3D') if label in self.widgets]
+        if '구 선택' in self.widgets:
+            actions += [('select', index) for index in range(len(self.widgets['구 선택'][1].options))]
+        return actions
+
+    async def step(self):
+        kind, arg = self.rng.choice(self.actions())
+        if kind == 'page':
+            return await self.open_page(arg)
+        if kind == 'toggle':
+            self.set(arg, not self.value(arg))
+            return await self.rerun('toggle_3d')
+        self.set('구 선택', arg)
+        return await self.rerun('select_gu')
+
+    async def run(self, actions, think_s):
+        await asyncio.sleep(self.rng.uniform(0, think_s))  # 세션마다 시작 시점을 흩뜨린다
+        await self.connect()
+        for _ in range(actions):
+            await asyncio.sleep(self.rng.uniform(0, think_s))
+            await self.step()
+
+
+async def warm_up(url):
+    """모든 페이지, EDA 토글, 시연의 모든 구를 한 번씩 열어 프로세스 캐시를 채운다."""
+    from petsinfra.views import PAGES
+
+    session = Session(url)
+    await session.connect()
+    try:
+        for page in PAGES:
+            await session.open_page(page)
+            for label in ('인구수 3D', '반려동물 3D'):
+                if label in session.widgets:
+                    session.set(label, True)
+                    await session.rerun('toggle_3d')
+            if '구 선택' in session.widgets:
+                for index in range(len(session.widgets['구 선택'][1].options)):
+                    session.set('구 선택', index)
+                    await session.rerun('select_gu')
+    finally:
+        session.close()
+    return sum(r['s'] for r in session.reruns)
+
+
+async def run_phase(url, pid, sessions, actions, think_s, seed):
+    """sessions 개 세션을 동시에 실행하고 지표를 반환한다."""
+    rss_before = server_rss_mb(pid)
+    clients = [Session(url, seed=seed * 1000 + i) for i in range(sessions)]
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(client.run(actions, think_s) for client in clients))
+        wall_s = time.perf_counter() - start
+        rss_connected = server_rss_mb(pid)
+    finally:
+        for client in clients:
+            client.close()
+
+    reruns = [r for client in clients for r in client.reruns]
+    by_action = {}
+    for r in reruns:
+        by_action.setdefault(r['action'].split('.')[0], []).append(r['s'])
+    result = {
+        'sessions': sessions,
+        'wall_s': wall_s,
+        'reruns': len(reruns),
+        'throughput_rps': len(reruns) / wall_s if wall_s else None,
+        'latency': _percentiles([r['s'] for r in reruns]),
+        'latency_by_action': {action: _percentiles(samples) for action, samples in sorted(by_action.items())},
+        'received_bytes': sum(r['bytes'] for r in reruns),
+        'errors': sum(r['errors'] for r in reruns),
+        'rss_before_mb': rss_before,
+        'rss_connected_mb': rss_connected,
+    }
+    if rss_before is not None and rss_connected is not None:
+        result['rss_growth_per_session_mb'] = (rss_connected - rss_before) / sessions
+    return result
+
+
+def _print_phase(result):
+    latency = result['latency']
+    rss = result.get('rss_growth_per_session_mb')
+    print(f"세션 {result['sessions']:>3}: 재실행 {result['reruns']}회, {result['throughput_rps']:.1f}/s, "
+          f"p50 {latency['p50_s'] * 1000:.0f} ms, p95 {latency['p95_s'] * 1000:.0f} ms, "
+          f"p99 {latency['p99_s'] * 1000:.0f} ms, 예외 {result['errors']}"
+          + (f", RSS {result['rss_connected_mb']:.0f} MB (세션당 {rss:+.1f} MB)" if rss is not None else ''),
+          file=sys.stderr)
+
+
+async def run(args):
+    env = dict(os.environ)
+    proc = None
+    url, pid = args.url, args.pid
+    if url is None:
+        port = args.port or _free_port()
+        proc = start_server(port, env)
+        url, pid = f'http://localhost:{port}', proc.pid
+    try:
+        report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'resource_dir': env.get('PETSINFRA_RESOURCE_DIR'),
+            'actions': args.actions,
+            'think_s': args.think,
+            'rss_start_mb': server_rss_mb(pid),
+        }
+        if not args.no_warm_up:
+            report['warm_up_s'] = await warm_up(url)
+            report['rss_warm_mb'] = server_rss_mb(pid)
+        report['phases'] = []
+        for sessions in args.sessions:
+            result = await run_phase(url, pid, sessions, args.actions, args.think, args.seed)
+            _print_phase(result)
+            report['phases'].append(result)
+        return report
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10], help='동시 세션 수 (단계별)')
+    parser.add_argument('--actions', type=int, default=20, help='세션마다 실행할 동작 수')
+    parser.add_argument('--think', type=float, default=0.5, help='동작 사이 최대 대기 시간(초)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--url', help='이미 실행 중인 서버 주소 (기본: 새 서버를 띄움)')
+    parser.add_argument('--pid', type=int, help='--url 서버의 프로세스 id (RSS 측정용)')
+    parser.add_argument('--port', type=int, help='새로 띄울 서버의 포트 (기본: 빈 포트)')
+    parser.add_argument('--no-warm-up', action='store_true', help='캐시를 미리 채우지 않음')
+    parser.add_argument('--output', help='결과 JSON 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(ROOT))
+    report = asyncio.run(run(args))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""벤치마크/부하 확인용 합성 입력.
+
+resource/ 와 같은 스키마의 seoul_pets.csv, pets_count.csv, seoul_pop.csv 를 factor 배 규모로 만든다.
+
+    python -m benchmarks.synthetic /tmp/res_x100 --scale 100
+    PETSINFRA_RESOURCE_DIR=/tmp/res_x100 streamlit run streamlt.py
+
+시설은 원본 행을 복제하고 복제본의 좌표를 흩뜨린다. 경계(GeoJSON)는 서울 자치구 그대로이므로
+구별 등록수와 인구도 factor 배로 늘려 인구/반려동물 대비 지표가 원본과 비슷한 범위에 있게 한다.
+1000배(약 437만 행)도 메모리에 한 번에 올리지 않도록 시설은 복제본 묶음 단위로 이어 쓴다.
+"""
+import argparse
+import codecs
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from petsinfra.paths import FACILITY_PATH, PETS_PATH, POPULATION_PATH, RESOURCE_DIR
+
+# 시설을 이어 쓸 때 한 번에 만드는 행 수 (대략)
+CHUNK_ROWS = 500_000
+
+
+def _facility_copies(facilities_df, copy_numbers, rng, jitter_m):
+    """copy_numbers 번째 복제본들. 0 번은 원본 그대로, 나머지는 좌표를 jitter_m 정도 흩뜨리고 이름에 번호를 붙인다."""
+    copies = pd.concat([facilities_df] * len(copy_numbers), ignore_index=True)
+    copy_no = np.repeat(copy_numbers, len(facilities_df))
+    jitter_deg = jitter_m / 111_000
+    moved = copy_no > 0
+    for column, scale in (('위도', 1.0), ('경도', 1 / np.cos(np.radians(37.56)))):
+        values = copies[column].to_numpy(dtype='float64', copy=True)
+        values[moved] += rng.normal(0, jitter_deg, moved.sum()) * scale
+        copies[column] = values.astype(copies[column].dtype)
+    copies.loc[moved, '시설명'] = copies.loc[moved, '시설명'] + ' #' + copy_no[moved].astype(str)
+    return copies
+
+
+def scale_facilities(facilities_df, factor, seed=0, jitter_m=300.0):
+    """시설 행을 factor 번 복제하고, 복제본의 좌표를 jitter_m 정도 흩뜨린다. 원본 행은 그대로 둔다."""
+    rng = np.random.default_rng(seed)
+    return _facility_copies(facilities_df, np.arange(factor), rng, jitter_m)
+
+
+def write_scaled_facilities(path, facilities_df, factor, seed=0, jitter_m=300.0):
+    """scale_facilities 결과를 path 에 CSV 로 쓴다. 복제본 묶음(CHUNK_ROWS 행 안팎) 단위로 이어 쓴다."""
+    rng = np.random.default_rng(seed)
+    per_chunk = max(1, CHUNK_ROWS // max(len(facilities_df), 1))
+    for first in range(0, factor, per_chunk):
+        chunk = _facility_copies(facilities_df, np.arange(first, min(first + per_chunk, factor)), rng, jitter_m)
+        chunk.to_csv(path, mode='w' if first == 0 else 'a', header=first == 0, index=False, encoding='utf-8')
+
+
+def scale_counts(counts_df, column, factor, seed=0, noise=0.05):
+    """구별 집계(column)를 factor 배로 늘린다. 구마다 noise 정도의 상대 오차를 섞는다."""
+    rng = np.random.default_rng(seed)
+    scaled = counts_df[column] * factor * rng.lognormal(0, noise, len(counts_df))
+    return counts_df.assign(**{column: scaled.round().astype('int64')})
+
+
+def _encoding(path):
+    # seoul_pop.csv 처럼 BOM 이 있는 파일은 BOM 을 유지한다
+    with open(path, 'rb') as f:
+        return 'utf-8-sig' if f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8 else 'utf-8'
+
+
+def _write_scaled_counts(source, out_path, column, factor, seed):
+    encoding = _encoding(source)
+    counts_df = pd.read_csv(source, encoding=encoding)
+    scale_counts(counts_df, column, factor, seed).to_csv(out_path, index=False, encoding=encoding)
+
+
+def write_scaled_resources(out_dir, factor, seed=0, counts=False):
+    """resource/ 의 입력 파일을 out_dir 에 복사하고 seoul_pets.csv 를 factor 배로 늘린다.
+
+    counts 이면 pets_count.csv(등록수)와 seoul_pop.csv(인구수)도 factor 배로 늘린다.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    scaled = {FACILITY_PATH, PETS_PATH, POPULATION_PATH} if counts else {FACILITY_PATH}
+    for path in RESOURCE_DIR.iterdir():
+        if path.is_file() and path not in scaled:
+            shutil.copy2(path, out_dir / path.name)
+    facilities_df = pd.read_csv(FACILITY_PATH, encoding='utf-8')
+    write_scaled_facilities(out_dir / FACILITY_PATH.name, facilities_df, factor, seed)
+    if counts:
+        _write_scaled_counts(PETS_PATH, out_dir / PETS_PATH.name, '등록수', factor, seed)
+        _write_scaled_counts(POPULATION_PATH, out_dir / POPULATION_PATH.name, '인구수', factor, seed)
+    return out_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('out_dir', help='합성 resource 디렉터리 (PETSINFRA_RESOURCE_DIR 로 지정)')
+    parser.add_argument('--scale', type=int, default=10, help='배율 (예: 10, 100, 1000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--facilities-only', action='store_true', help='등록수/인구수는 원본 그대로 복사')
+    args = parser.parse_args(argv)
+    out_dir = write_scaled_resources(args.out_dir, args.scale, args.seed, counts=not args.facilities_only)
+    print(out_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""서울 반려동물 인프라 대시보드의 데이터/연산 계층."""
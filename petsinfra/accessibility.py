@@ -0,0 +1,142 @@
+"""격자 기반 반려동물 인프라 접근성 (2단계 유동 집수 구역, 2SFCA).
+
+서울을 cell_m 미터 칸으로 한 번 나누고 칸마다 행정동/자치구를 정해 둔다.
+
+1. 공급 S: 칸별·카테고리별 시설 수 (좌표를 칸 번호로 바꿔 bincount)
+2. 수요 D: 구별 반려동물 등록수를 그 구에 속한 칸에 고르게 나눈 값 (칸 단위 인구 자료가 없으므로)
+3. 시설 칸 j 의 공급/수요 비율 R_j = S_j / Σ_k D_k w(d_kj)  (주변 수요를 거리 감쇠로 합한 것)
+4. 접근성 A_i = Σ_j R_j w(d_ij)  (칸 i 의 반려동물 한 마리가 이용할 수 있는 시설 수)
+
+w 는 가우시안 거리 감쇠 exp(-d²/2σ²) (σ = bandwidth_m, 3σ 밖은 0)이다. Σ w(d) 는 격자 위의
+합성곱이므로 모든 카테고리를 FFT 한 번씩으로 계산한다. A 는 S 에 선형이라 여러 카테고리의
+접근성은 카테고리별 A 의 합이다.
+
+접근성 지수 = A / (서울 전체 시설 수 / 전체 등록수). 1 이면 서울 평균, 1 보다 작으면 주변
+반려동물 수에 비해 이용할 수 있는 시설이 부족한 곳이다.
+"""
+import numpy as np
+import pandas as pd
+
+from petsinfra import spatial
+from petsinfra.proximity import EARTH_RADIUS_M
+
+
+def _smooth(grids, sigma_cells):
+    """(..., 높이, 너비) 격자들을 가우시안 커널(반경 3σ)로 합성곱한다. 격자 밖은 0 으로 본다."""
+    radius = max(1, int(np.ceil(3 * sigma_cells)))
+    offsets = np.arange(-radius, radius + 1)
+    kernel_1d = np.exp(-offsets ** 2 / (2 * sigma_cells ** 2))
+    kernel = np.outer(kernel_1d, kernel_1d)
+
+    height, width = grids.shape[-2:]
+    shape = (height + 2 * radius, width + 2 * radius)
+    spectrum = np.fft.rfft2(grids, shape) * np.fft.rfft2(kernel, shape)
+    full = np.fft.irfft2(spectrum, shape)
+    return full[..., radius:radius + height, radius:radius + width]
+
+
+class AccessibilityGrid:
+    """서울 격자와 칸별 행정동/자치구, 반려동물 수요.
+
+    seoul_gdf 는 행정동 단위 경계(sggnm, adm_cd, adm_nm), pets 는 자치구 이름을 index 로 하는
+    등록수 Series 이다. 격자의 0 행이 남쪽이다.
+    """
+
+    def __init__(self, seoul_gdf, pets, cell_m=250.0):
+        self.cell_m = cell_m
+        west, south, east, north = seoul_gdf.total_bounds
+        lat0 = np.radians((south + north) / 2)
+        self.cell_lat = np.degrees(cell_m / EARTH_RADIUS_M)
+        self.cell_lon = self.cell_lat / np.cos(lat0)
+        self.west, self.south = west, south
+        self.width = int(np.ceil((east - west) / self.cell_lon))
+        self.height = int(np.ceil((north - south) / self.cell_lat))
+        self.bounds = (west, south, west + self.width * self.cell_lon, south + self.height * self.cell_lat)
+
+        # 칸 중심이 속한 행정동 (서울 밖이면 -1)
+        rows, columns = np.divmod(np.arange(self.height * self.width), self.width)
+        lon = west + (columns + 0.5) * self.cell_lon
+        lat = south + (rows + 0.5) * self.cell_lat
+        self.dong = spatial.assign_points(seoul_gdf.geometry.values, lon, lat)
+        self.inside = self.dong >= 0
+
+        self.dongs = pd.DataFrame({
+            'sggnm': seoul_gdf['sggnm'].to_numpy(),
+            'adm_cd': seoul_gdf['adm_cd'].to_numpy(),
+            '행정동': seoul_gdf['adm_nm'].str.rsplit(' ', n=1).str[-1].to_numpy(),
+        })
+        # 칸 중심이 하나도 들어가지 않는 작은 동은 동 중심이 있는 칸의 값을 쓴다
+        center = seoul_gdf.geometry.representative_point()
+        self._dong_cell = self.cell_index(center.y.to_numpy(), center.x.to_numpy())
+
+        # 수요: 구별 등록수를 그 구의 칸에 고르게 나눈다
+        cell_gu = np.where(self.inside, self.dongs['sggnm'].to_numpy()[np.maximum(self.dong, 0)], None)
+        gu_cells = pd.Series(cell_gu[self.inside]).value_counts()
+        per_cell = pd.Series(pets, dtype='float64') / gu_cells
+        demand = np.zeros(self.height * self.width)
+        demand[self.inside] = per_cell.reindex(cell_gu[self.inside]).fillna(0).to_numpy()
+        self.demand = demand.reshape(self.height, self.width)
+
+    def cell_index(self, lat, lon):
+        """좌표가 속한 칸 번호 (행 * 너비 + 열). 격자 밖이면 -1."""
+        row = np.floor((np.asarray(lat, dtype='float64') - self.south) / self.cell_lat).astype(np.int64)
+        column = np.floor((np.asarray(lon, dtype='float64') - self.west) / self.cell_lon).astype(np.int64)
+        valid = (row >= 0) & (row < self.height) & (column >= 0) & (column < self.width)
+        return np.where(valid, row * self.width + column, -1)
+
+    def supply(self, lat, lon, codes, n_categories):
+        """(카테고리 수, 높이, 너비) 칸별 시설 수. codes 는 시설마다 카테고리 번호 (음수는 제외)."""
+        cell = self.cell_index(lat, lon)
+        valid = (cell >= 0) & (codes >= 0)
+        size = self.height * self.width
+        counts = np.bincount(codes[valid] * size + cell[valid], minlength=n_categories * size)
+        return counts.reshape(n_categories, self.height, self.width).astype('float64')
+
+    def scores(self, facilities_df, bandwidth_m=1000.0):
+        """facilities_df(위도, 경도, 카테고리3)의 카테고리별 접근성 (Accessibility)."""
+        category = facilities_df['카테고리3'].astype('category')
+        supply = self.supply(facilities_df['위도'], facilities_df['경도'],
+                             category.cat.codes.to_numpy().astype(np.int64), len(category.cat.categories))
+        sigma = bandwidth_m / self.cell_m
+        catchment = _smooth(self.demand, sigma)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(catchment > 1e-9, supply / catchment, 0.0)
+        access = np.clip(_smooth(ratio, sigma), 0, None)
+        return Accessibility(self, list(category.cat.categories), supply.sum(axis=(1, 2)), access)
+
+
+class Accessibility:
+    """카테고리별 접근성 격자. access[c] 는 칸마다 반려동물 한 마리당 이용 가능한 c 시설 수이다."""
+
+    def __init__(self, grid, categories, totals, access):
+        self.grid = grid
+        self.categories = categories
+        self._index = {category: i for i, category in enumerate(categories)}
+        self.totals = totals  # 카테고리별 격자 안 시설 수
+        self.access = access.astype('float32')
+
+    def _select(self, categories):
+        rows = [self._index[c] for c in (categories or self.categories) if c in self._index]
+        return self.access[rows].sum(axis=0), self.totals[rows].sum()
+
+    def index(self, categories=None):
+        """(높이, 너비) 접근성 지수 (서울 평균 = 1, 서울 밖 칸은 NaN). categories 가 없으면 전체."""
+        access, total = self._select(categories)
+        city = total / self.grid.demand.sum() if total else np.nan
+        values = np.where(self.grid.inside.reshape(access.shape), access / city, np.nan)
+        return values
+
+    def dong_scores(self, categories=None):
+        """행정동별 접근성 지수 (동 안 칸들의 수요 가중 평균)와 추정 수요(반려동물 수)."""
+        grid = self.grid
+        values = self.index(categories).ravel()
+        demand = grid.demand.ravel()
+        dong = grid.dong[grid.inside]
+        n = len(grid.dongs)
+        weights = np.bincount(dong, weights=demand[grid.inside], minlength=n)
+        weighted = np.bincount(dong, weights=(values * demand)[grid.inside], minlength=n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = weighted / weights
+        fallback = np.where(grid._dong_cell >= 0, values[np.maximum(grid._dong_cell, 0)], np.nan)
+        score = np.where(weights > 0, score, fallback)
+        return grid.dongs.assign(접근성지수=score, 추정반려동물수=weights.round())
@@ -0,0 +1,296 @@
+"""대시보드와 같은 데이터 계층을 쓰는 읽기 전용 HTTP API (Flask).
+
+    python -m petsinfra.api --port 8502                       # 단독 실행
+    PETSINFRA_API_PORT=8502 streamlit run streamlt.py         # Streamlit 과 같은 프로세스에서 실행
+
+같은 프로세스에서 띄우면 loader 의 캐시(시설 색인, 병합 결과 등)를 Streamlit 세션과 함께 쓴다.
+요청마다 loader.pin() 으로 데이터 버전을 고정하므로 resource/ 가 바뀌면 다음 요청부터 새 버전을
+돌려준다.
+
+응답은 JSON(레코드 목록) 또는 Arrow IPC 스트림(``?format=arrow`` 나
+``Accept: application/vnd.apache.arrow.stream``)이다. 인코딩한 본문은 (데이터 버전, 경로,
+인자, 형식)마다 한 번만 만들어 두고, 본문의 해시를 ETag 로 쓴다. If-None-Match 가 맞으면
+본문 없이 304 를 돌려주고, 클라이언트가 gzip 을 받으면 압축본(역시 한 번만 만든다)을 보낸다.
+목록 응답의 전체 행 수는 X-Total-Count 헤더에 담는다.
+
+    GET /api/version
+    GET /api/districts                               자치구별 인구수/등록수/인프라개수와 파생 지표
+    GET /api/districts/categories?level=카테고리2     자치구 × 카테고리 시설 수 (긴 형식)
+    GET /api/facilities?gu=&category=&category2=&q=&open_now=1&at=&holiday=1&limit=&offset=
+    GET /api/facilities/near?lat=&lon=&radius_m=&k=&category=&open_now=1&at=
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import math
+import os
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pyarrow as pa
+from flask import Flask, Response, jsonify, request
+from werkzeug.exceptions import BadRequest, HTTPException
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from petsinfra import facilities, loader, metrics, profiling
+
+# Streamlit 과 같은 프로세스에서 API 를 띄울 포트 (없으면 띄우지 않음)
+PORT = int(os.environ.get('PETSINFRA_API_PORT', 0)) or None
+HOST = os.environ.get('PETSINFRA_API_HOST', '127.0.0.1')
+
+TIMEZONE = ZoneInfo('Asia/Seoul')
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+JSON_MIMETYPE = 'application/json'
+# 이보다 작은 본문은 압축하지 않는다
+GZIP_MIN_BYTES = 1024
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 50_000
+
+DISTRICT_COLUMNS = ['sggnm', '인구수', '등록수', '인프라개수', '정규화인구', '정규화반려동물', '인프라당반려동물']
+FACILITY_COLUMNS = facilities.MAP_COLUMNS
+
+
+class Encoded:
+    """인코딩을 마친 응답 본문과 ETag. gzip 압축본은 처음 요청될 때 만든다."""
+
+    def __init__(self, body, mimetype, total=None):
+        self.body = body
+        self.mimetype = mimetype
+        self.total = total
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self._gzipped = None
+
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzipped
+
+
+def _encode(df, fmt, total=None):
+    if fmt == 'arrow':
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Encoded(sink.getvalue(), ARROW_MIMETYPE, total)
+    body = df.to_json(orient='records', force_ascii=False, date_format='iso')
+    return Encoded(body.encode('utf-8'), JSON_MIMETYPE, total)
+
+
+# --- 조회 (인자는 모두 해시 가능한 값, 결과는 (DataFrame, 전체 행 수)) ---
+
+def districts():
+    return loader.load_merged()[DISTRICT_COLUMNS], None
+
+
+def district_categories(level='카테고리2'):
+    if level not in metrics.LEVELS:
+        raise BadRequest(f"level 은 {', '.join(metrics.LEVELS)} 중 하나여야 합니다")
+    return loader.load_district_metrics().frame(level), None
+
+
+def _open_mask(open_at, holiday):
+    if open_at is None:
+        return None
+    return loader.load_opening_hours().open_at(datetime.fromisoformat(open_at), holiday)
+
+
+def facility_list(gu=(), category=(), category2=(), q='', open_at=None, holiday=False,
+                  limit=DEFAULT_LIMIT, offset=0):
+    filters = {'시군구 명칭': list(gu), '카테고리3': list(category), '카테고리2': list(category2)}
+    rows = loader.load_facility_search().query(q, filters)
+    mask = _open_mask(open_at, holiday)
+    if mask is not None:
+        rows = rows[mask[rows]]
+    page = loader.load_facilities(FACILITY_COLUMNS).iloc[rows[offset:offset + limit]]
+    return page, len(rows)
+
+
+def facility_near(lat, lon, radius_m=None, k=None, category=(), open_at=None, holiday=False):
+    if radius_m is None and k is None:
+        radius_m = 1000.0
+    mask = _open_mask(open_at, holiday)
+    nearby = loader.load_proximity().query(lat, lon, radius_m=radius_m, k=k, categories=list(category), mask=mask)
+    return nearby, len(nearby)
+
+
+QUERIES = {
+    'districts': districts,
+    'district_categories': district_categories,
+    'facility_list': facility_list,
+    'facility_near': facility_near,
+}
+
+
+@profiling.cache_resource(max_entries=256)
+def _encoded(version, name, params, fmt):
+    df, total = QUERIES[name](**dict(params))
+    return _encode(df, fmt, total)
+
+
+# --- 요청 인자 해석 ---
+
+def _format():
+    fmt = request.args.get('format')
+    if fmt is None:
+        best = request.accept_mimetypes.best_match([JSON_MIMETYPE, ARROW_MIMETYPE], default=JSON_MIMETYPE)
+        fmt = 'arrow' if best == ARROW_MIMETYPE else 'json'
+    if fmt not in ('json', 'arrow'):
+        raise BadRequest("format 은 json 또는 arrow 여야 합니다")
+    return fmt
+
+
+def _number(name, kind, default=None, minimum=None, maximum=None):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = kind(value)
+    except ValueError:
+        raise BadRequest(f"{name} 값이 올바르지 않습니다: {request.args.get(name)}") from None
+    if not math.isfinite(value):
+        raise BadRequest(f"{name} 은 유한한 숫자여야 합니다: {request.args.get(name)}")
+    below = minimum is not None and value < minimum
+    above = maximum is not None and value > maximum
+    if below or above:
+        if minimum is None:
+            raise BadRequest(f"{name} 은 {maximum} 이하여야 합니다")
+        if maximum is None:
+            raise BadRequest(f"{name} 은 {minimum} 이상이어야 합니다")
+        raise BadRequest(f"{name} 은 {minimum} ~ {maximum} 범위여야 합니다")
+    return value
+
+
+def _flag(name):
+    return request.args.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def _values(name):
+    """반복 인자(?category=a&category=b)나 쉼표로 구분한 값을 정렬된 튜플로."""
+    values = [v.strip() for raw in request.args.getlist(name) for v in raw.split(',')]
+    return tuple(sorted(v for v in values if v))
+
+
+def _open_at():
+    """영업 중 필터의 기준 시각 (분 단위 ISO 문자열). 필터가 없으면 None."""
+    at = request.args.get('at')
+    if at:
+        try:
+            when = datetime.fromisoformat(at)
+        except ValueError:
+            raise BadRequest(f"at 값이 올바르지 않습니다: {at}") from None
+    elif _flag('open_now'):
+        when = datetime.now(TIMEZONE)
+    else:
+        return None
+    if when.tzinfo is not None:
+        when = when.astimezone(TIMEZONE)
+    return when.replace(second=0, microsecond=0, tzinfo=None).isoformat()
+
+
+def _respond(name, **params):
+    snapshot = loader.pin()
+    encoded = _encoded(snapshot.version, name, tuple(sorted(params.items())), _format())
+
+    use_gzip = len(encoded.body) >= GZIP_MIN_BYTES and 'gzip' in request.accept_encodings
+    response = Response(encoded.gzipped() if use_gzip else encoded.body, mimetype=encoded.mimetype)
+    # 같은 내용이라도 압축 여부에 따라 본문이 다르므로 ETag 를 구분한다
+    response.set_etag(encoded.etag + ('-gzip' if use_gzip else ''))
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'  # 데이터가 바뀔 수 있으므로 매번 ETag 로 확인
+    response.headers['X-Data-Version'] = snapshot.version
+    if encoded.total is not None:
+        response.headers['X-Total-Count'] = str(encoded.total)
+    return response.make_conditional(request)
+
+
+def create_app():
+    """API Flask 앱. gunicorn 등에서는 'petsinfra.api:create_app()' 으로 띄운다."""
+    app = Flask(__name__)
+    app.json.ensure_ascii = False
+
+    @app.errorhandler(HTTPException)
+    def error(e):
+        response = jsonify(error=e.description)
+        response.status_code = e.code
+        return response
+
+    @app.get('/api/version')
+    def version():
+        snapshot = loader.pin()
+        return jsonify(version=snapshot.version, inputs={name: key[1] for name, key in snapshot.keys.items()})
+
+    @app.get('/api/districts')
+    def district_table():
+        return _respond('districts')
+
+    @app.get('/api/districts/categories')
+    def district_category_table():
+        return _respond('district_categories', level=request.args.get('level', '카테고리2'))
+
+    @app.get('/api/facilities')
+    def facility_table():
+        open_at = _open_at()
+        return _respond(
+            'facility_list',
+            gu=_values('gu'), category=_values('category'), category2=_values('category2'),
+            q=' '.join(request.args.get('q', '').split()),
+            open_at=open_at, holiday=open_at is not None and _flag('holiday'),
+            limit=_number('limit', int, DEFAULT_LIMIT, 0, MAX_LIMIT),
+            offset=_number('offset', int, 0, 0),
+        )
+
+    @app.get('/api/facilities/near')
+    def facility_near_table():
+        lat = _number('lat', float, minimum=-90, maximum=90)
+        lon = _number('lon', float, minimum=-180, maximum=180)
+        if lat is None or lon is None:
+            raise BadRequest("lat, lon 이 필요합니다")
+        open_at = _open_at()
+        return _respond(
+            'facility_near',
+            lat=lat, lon=lon,
+            radius_m=_number('radius_m', float, minimum=0, maximum=50_000),
+            k=_number('k', int, minimum=1, maximum=MAX_LIMIT),
+            category=_values('category'),
+            open_at=open_at, holiday=open_at is not None and _flag('holiday'),
+        )
+
+    return app
+
+
+class _QuietHandler(WSGIRequestHandler):
+    # Streamlit 로그에 요청마다 한 줄씩 섞이지 않도록 접근 로그를 남기지 않는다
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_background(port, host=HOST):
+    """이 프로세스에서 API 서버를 백그라운드 스레드로 한 번만 띄운다 (Streamlit 재실행마다 호출해도 된다)."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = make_server(host, port, create_app(), threaded=True, request_handler=_QuietHandler)
+            threading.Thread(target=_server.serve_forever, name='petsinfra-api', daemon=True).start()
+    return _server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT or 8502)
+    args = parser.parse_args(argv)
+    loader.refresh()
+    make_server(args.host, args.port, create_app(), threaded=True).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
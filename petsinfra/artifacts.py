@@ -0,0 +1,77 @@
+"""빌드 산출물(resource/build/)의 기록과 최신 여부 확인.
+
+각 산출물은 만들 때 사용한 입력 파일의 SHA-256 을 manifest.json 에 남긴다.
+앱은 고정한 스냅샷의 입력과 기록이 같을 때만 산출물을 읽고, 그렇지 않으면 원본에서 직접 계산한다.
+
+산출물과 manifest.json 은 같은 디렉터리의 임시 파일에 쓴 뒤 os.replace 로 바꿔 넣는다(replacing).
+앱이 실행 중일 때 빌드해도 읽는 쪽은 이전 파일이나 새 파일 중 하나를 온전히 보며, 메모리 매핑된
+이전 파일(시설 저장소)은 새 파일과 다른 inode 로 남아 있던 DataFrame 이 그대로 쓸 수 있다.
+"""
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+from petsinfra.paths import BUILD_DIR
+
+MANIFEST_PATH = BUILD_DIR / 'manifest.json'
+
+
+def file_digest(path):
+    """파일 내용의 SHA-256 (hex)."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@contextmanager
+def replacing(path):
+    """path 대신 쓸 임시 경로를 주고, 블록이 끝나면 path 를 그 파일로 바꿔 넣는다. 실패하면 임시 파일만 지운다.
+
+        with artifacts.replacing(BUILD_DIR / name) as tmp:
+            df.to_parquet(tmp)
+    """
+    path = Path(path)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def read_manifest():
+    try:
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def record(name, sources):
+    """산출물 name 이 sources(입력 경로 목록)로부터 만들어졌음을 기록한다."""
+    manifest = read_manifest()
+    manifest[name] = {str(p.name): file_digest(p) for p in sources}
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    with replacing(MANIFEST_PATH) as tmp:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def fresh_path(name, keys):
+    """산출물이 존재하고 keys 의 입력으로 만들어졌으면 경로를, 아니면 None 을 반환한다.
+
+    keys 는 loader 스냅샷의 입력 키((경로, SHA-256), ...)이다. 파일을 다시 읽지 않고 고정된
+    키와 비교하므로, 재실행 도중 원본이 바뀌어도 그 스냅샷의 입력과 맞는 산출물만 쓴다.
+    """
+    path = BUILD_DIR / name
+    entry = read_manifest().get(name)
+    if entry is None or not path.exists():
+        return None
+    for source, digest in keys:
+        if entry.get(Path(source).name) != digest:
+            return None
+    return path
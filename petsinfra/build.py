@@ -0,0 +1,118 @@
+"""런타임에 반복하던 전처리를 미리 수행해 resource/build/ 에 저장한다.
+
+    python -m petsinfra.build
+
+산출물은 manifest.json 에 입력 파일의 해시와 함께 기록되며, 입력이 바뀌면
+앱은 자동으로 원본에서 다시 계산한다 (그 후 이 명령을 다시 실행하면 된다).
+파일은 모두 임시 파일에 쓴 뒤 바꿔 넣으므로(artifacts.replacing) 앱을 띄운 채로 실행해도 된다.
+"""
+import time
+
+import geopandas as gpd
+import pandas as pd
+
+from petsinfra import artifacts, facilities, geometry, spatial
+from petsinfra.paths import BUILD_DIR, FACILITY_PATH, INFRA_COUNT_PATH, SEOUL_GEO_PATH
+
+GU_PARQUET = 'seoul_gu.parquet'
+GU_GEOJSON = 'seoul_gu.geojson'
+GU_LOD_PARQUET = 'seoul_gu_lod.parquet'
+DONG_LOD_PARQUET = 'seoul_dong_lod.parquet'
+FACILITY_STORE = 'seoul_pets.arrow'
+FACILITY_AREAS = 'facility_areas.parquet'
+COUNT_REPORT = 'infra_count_report.csv'
+
+
+def gu_lod_geojson(zoom):
+    """줌 단계별 단순화 경계 GeoJSON 산출물 이름."""
+    return f'seoul_gu_z{zoom}.geojson'
+
+
+def build_gu_geometry():
+    """자치구 dissolve + 중심 좌표를 GeoParquet 으로, 경계를 GeoJSON 문자열로 저장."""
+    seoul_gdf = gpd.read_file(SEOUL_GEO_PATH)
+    seoul_gu_gdf = geometry.dissolve_gu(seoul_gdf)
+
+    # 병합 키(sggnm)는 컬럼으로 저장하고 로드 시 index 로 되돌린다
+    with artifacts.replacing(BUILD_DIR / GU_PARQUET) as tmp:
+        seoul_gu_gdf.reset_index().to_parquet(tmp)
+    artifacts.record(GU_PARQUET, [SEOUL_GEO_PATH])
+
+    geojson = geometry.to_geojson(seoul_gu_gdf.drop(columns=['center_lat', 'center_lon']))
+    with artifacts.replacing(BUILD_DIR / GU_GEOJSON) as tmp:
+        tmp.write_text(geojson, encoding='utf-8')
+    artifacts.record(GU_GEOJSON, [SEOUL_GEO_PATH])
+
+
+def build_gu_lod():
+    """줌 단계별 단순화 경계를 GeoParquet(전 단계)과 단계별 GeoJSON 문자열로 저장."""
+    seoul_gu_gdf = geometry.dissolve_gu(gpd.read_file(SEOUL_GEO_PATH))
+    tiers = geometry.build_lod(seoul_gu_gdf)
+
+    lod_gdf = pd.concat([
+        gpd.GeoDataFrame({'sggnm': series.index, 'zoom': zoom}, geometry=series.values, crs=series.crs)
+        for zoom, series in tiers.items()
+    ], ignore_index=True)
+    with artifacts.replacing(BUILD_DIR / GU_LOD_PARQUET) as tmp:
+        lod_gdf.to_parquet(tmp)
+    artifacts.record(GU_LOD_PARQUET, [SEOUL_GEO_PATH])
+
+    for zoom, series in tiers.items():
+        geojson = geometry.to_geojson(gpd.GeoDataFrame(geometry=series))
+        with artifacts.replacing(BUILD_DIR / gu_lod_geojson(zoom)) as tmp:
+            tmp.write_text(geojson, encoding='utf-8')
+        artifacts.record(gu_lod_geojson(zoom), [SEOUL_GEO_PATH])
+
+
+def build_dong_lod():
+    """구를 선택했을 때 그리는 행정동 단순화 경계를 GeoParquet 으로 저장."""
+    seoul_gdf = gpd.read_file(SEOUL_GEO_PATH).set_index('adm_cd')
+    dong_lod = geometry.dong_lod(seoul_gdf)
+    with artifacts.replacing(BUILD_DIR / DONG_LOD_PARQUET) as tmp:
+        dong_lod.reset_index().to_parquet(tmp)
+    artifacts.record(DONG_LOD_PARQUET, [SEOUL_GEO_PATH])
+
+
+def build_facility_store():
+    """시설 목록을 타입이 지정된 Arrow IPC 파일로 저장."""
+    facilities.write_store(facilities.read_csv(FACILITY_PATH), BUILD_DIR / FACILITY_STORE)
+    artifacts.record(FACILITY_STORE, [FACILITY_PATH])
+
+
+def build_facility_areas():
+    """시설마다 좌표가 속한 자치구/행정동을 저장하고, infra_count.csv 와의 차이를 보고."""
+    seoul_gdf = gpd.read_file(SEOUL_GEO_PATH)
+    facilities_df = facilities.read_csv(FACILITY_PATH)
+    areas = spatial.assign_facilities(seoul_gdf, facilities_df)
+    with artifacts.replacing(BUILD_DIR / FACILITY_AREAS) as tmp:
+        areas.to_parquet(tmp)
+    artifacts.record(FACILITY_AREAS, [FACILITY_PATH, SEOUL_GEO_PATH])
+
+    infra_count = pd.read_csv(INFRA_COUNT_PATH, encoding='utf-8')
+    report = spatial.count_report(areas, facilities_df, infra_count)
+    with artifacts.replacing(BUILD_DIR / COUNT_REPORT) as tmp:
+        report.to_csv(tmp, encoding='utf-8')
+    mismatched = spatial.mismatched_facilities(areas, facilities_df)
+    print(f"  자치구 개수 불일치 {(~report['일치']).sum()}곳, 자치구 표기 불일치 시설 {len(mismatched)}곳"
+          f" (자세한 내용: {BUILD_DIR / COUNT_REPORT})")
+
+
+STEPS = [
+    build_gu_geometry,
+    build_gu_lod,
+    build_dong_lod,
+    build_facility_store,
+    build_facility_areas,
+]
+
+
+def main():
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    for step in STEPS:
+        start = time.perf_counter()
+        step()
+        print(f"{step.__name__}: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
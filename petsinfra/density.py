@@ -0,0 +1,67 @@
+"""시설 좌표를 육각형 격자로 집계하는 밀도 계산.
+
+서버에서 NumPy 로 좌표를 육각형 칸 번호로 바꾸고 칸별 개수만 남기므로, 브라우저에는
+시설 점 대신 칸의 중심 좌표와 개수만 전달된다.
+"""
+import numpy as np
+import pandas as pd
+
+from petsinfra.proximity import EARTH_RADIUS_M
+
+SQRT3 = np.sqrt(3.0)
+
+
+def _cube_round(q, r):
+    # 축 좌표(q, r)를 가장 가까운 육각형 칸으로 반올림
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype('int64'), rr.astype('int64')
+
+
+def hex_bin(lat, lon, size_m, lat0=37.563383):
+    """좌표를 한 변이 size_m 미터인 뾰족한(pointy-top) 육각형 칸으로 집계한다.
+
+    lat0 는 경도 1도의 길이를 정하는 기준 위도이다. 반환값은 칸마다
+    중심 좌표('위도', '경도')와 '시설수' 이다.
+    """
+    lat = np.asarray(lat, dtype='float64')
+    lon = np.asarray(lon, dtype='float64')
+    m_per_deg = np.radians(1.0) * EARTH_RADIUS_M
+    m_per_deg_lon = m_per_deg * np.cos(np.radians(lat0))
+    x = lon * m_per_deg_lon
+    y = lat * m_per_deg
+
+    q, r = _cube_round((SQRT3 / 3 * x - y / 3) / size_m, (2 / 3 * y) / size_m)
+    r_min, r_span = (r.min(), r.max() - r.min() + 1) if len(r) else (0, 1)
+    keys, counts = np.unique((q * r_span) + (r - r_min), return_counts=True)
+    q = np.floor_divide(keys, r_span)
+    r = keys - q * r_span + r_min
+
+    center_x = size_m * SQRT3 * (q + r / 2)
+    center_y = size_m * 1.5 * r
+    # 칸 중심은 칸 크기보다 훨씬 정밀할 필요가 없으므로 전송량을 줄이려 반올림 (약 1m)
+    return pd.DataFrame({
+        '위도': np.round(center_y / m_per_deg, 5),
+        '경도': np.round(center_x / m_per_deg_lon, 5),
+        '시설수': counts,
+    })
+
+
+def facility_density(facilities_df, size_m, categories2=(), categories3=()):
+    """카테고리2/3 로 거른 시설의 육각형 밀도. 카테고리를 주지 않으면 거르지 않는다.
+
+    지도 색상용 '정규화개수'(최댓값 대비 비율) 컬럼이 추가된다.
+    """
+    mask = np.ones(len(facilities_df), dtype=bool)
+    if categories2:
+        mask &= facilities_df['카테고리2'].isin(categories2).to_numpy()
+    if categories3:
+        mask &= facilities_df['카테고리3'].isin(categories3).to_numpy()
+    bins = hex_bin(facilities_df['위도'].to_numpy()[mask], facilities_df['경도'].to_numpy()[mask], size_m)
+    bins['정규화개수'] = (bins['시설수'] / bins['시설수'].max()).round(3) if len(bins) else 0.0
+    return bins
@@ -0,0 +1,78 @@
+"""반려동물 동반 시설(seoul_pets.csv)의 열 지향 저장소.
+
+반복되는 문자열 필드는 category(Arrow dictionary)로, 좌표는 float32 로 저장한다.
+빌드 단계에서 압축하지 않은 Arrow IPC 파일로 써 두면 메모리 매핑으로 읽을 수 있다.
+좌표(결측 없는 숫자)와 문자열(pandas ArrowDtype) 컬럼은 매핑된 버퍼를 복사하지 않고 그대로 쓰며,
+category 는 코드 배열만 만든다. 컬럼 일부만 필요한 곳에는 ``project`` 로 같은 배열을 공유하는
+DataFrame 을 만들어 준다. CSV 에서 읽을 때도 문자열은 같은 ArrowDtype 으로 바꿔 두 경로의 타입을 맞춘다.
+"""
+import pandas as pd
+import pyarrow as pa
+
+from petsinfra import artifacts
+
+# 값의 종류가 적어 category 로 저장하는 컬럼
+CATEGORICAL_COLUMNS = [
+    '카테고리1', '카테고리2', '카테고리3', '시도 명칭', '시군구 명칭', '법정읍면동명칭',
+    '휴무일', '주차 가능여부', '입장(이용료)가격 정보', '반려동물 동반 가능정보',
+    '반려동물 전용 정보', '입장 가능 동물 크기', '반려동물 제한사항', '장소(실내) 여부',
+    '장소(실외)여부', '기본 정보_장소설명', '애견 동반 추가 요금', '최종작성일',
+]
+COORDINATE_COLUMNS = ['위도', '경도']
+
+# 지도 마커 hover 에 표시하는 상세 정보
+DETAIL_COLUMNS = [
+    '도로명주소', '전화번호', '운영시간', '휴무일',
+    '주차 가능여부', '반려동물 동반 가능정보', '반려동물 전용 정보',
+    '입장 가능 동물 크기', '반려동물 제한사항', '장소(실내) 여부',
+    '애견 동반 추가 요금', '기본 정보_장소설명',
+]
+
+# 페이지별로 읽는 컬럼 (None 은 전체)
+MAP_COLUMNS = ['시설명', '카테고리3', '시군구 명칭', *COORDINATE_COLUMNS, *DETAIL_COLUMNS]
+
+DTYPES = {
+    **{column: 'category' for column in CATEGORICAL_COLUMNS},
+    **{column: 'float32' for column in COORDINATE_COLUMNS},
+}
+STRING_DTYPE = pd.ArrowDtype(pa.string())
+
+
+def read_csv(path, columns=None):
+    """CSV 를 타입을 지정해 읽는다. 저장소 파일이 없을 때 사용한다."""
+    df = pd.read_csv(path, encoding='utf-8', dtype=DTYPES, usecols=columns)
+    strings = df.columns[df.dtypes == object]
+    return df.astype(dict.fromkeys(strings, STRING_DTYPE))
+
+
+def write_store(df, path):
+    """압축하지 않은 Arrow IPC(Feather v2) 파일로 저장한다. (메모리 매핑 가능)
+
+    기존 파일을 덮어쓰지 않고 새 파일로 바꿔 넣는다. read_store 가 돌려준 DataFrame 은 매핑된
+    파일을 직접 가리키므로, 제자리에서 다시 쓰면 그 DataFrame 을 쓰는 프로세스가 SIGBUS 로 죽는다.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with artifacts.replacing(path) as tmp:
+        with pa.OSFile(str(tmp), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def _arrow_strings(arrow_type):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def read_store(path, columns=None):
+    """저장소 파일을 메모리 매핑으로 열어 DataFrame 으로 만든다. 숫자/문자열 컬럼은 매핑된 버퍼를 그대로 쓴다."""
+    table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    # split_blocks: 컬럼을 하나의 2차원 블록으로 합치지 않아야 결측 없는 숫자 컬럼을 복사하지 않는다
+    return table.to_pandas(split_blocks=True, types_mapper=_arrow_strings)
+
+
+def project(df, columns):
+    """df 의 columns 만 담은 DataFrame. df[columns] 와 달리 컬럼 배열을 복사하지 않고 공유한다."""
+    return pd.DataFrame({column: df[column] for column in columns}, copy=False)
@@ -0,0 +1,175 @@
+"""자치구 → 카테고리3 → 연속된 행 구간 색인과 미리 만들어 둔 지도 마커 trace.
+
+시설 목록을 (자치구, 카테고리3) 순으로 한 번 정렬해 두면 한 구의 한 카테고리는
+연속된 행 구간이 된다. hover 문자열과 trace 는 구를 처음 그릴 때 한 번 만들어 두므로, 다시
+그 구를 고를 때는 만들어진 trace 목록을 꺼내기만 하면 된다. (시설이 많아 래스터로 그리는 구는
+hover 문자열을 만들지 않는다) 영업 중 필터처럼 원래 행 순서의 mask 를
+주면 구간마다 mask 를 정렬 순서로 옮겨 골라낸 trace 를 만든다.
+
+``points`` 는 경량 지도(pydeck)용으로 hover 문자열 없이 좌표와 원래 행 위치만 담은
+카테고리별 표를 돌려준다. 시설 상세 정보는 클릭한 시설 하나만 따로 가져와 보여준다.
+시설이 아주 많은 구는 ``coordinates`` 로 좌표와 카테고리 번호만 꺼내 래스터로 그린다 (raster.py).
+"""
+import numpy as np
+import pandas as pd
+
+from petsinfra.facilities import DETAIL_COLUMNS
+
+MARKER_STYLES = {
+    '동물병원': {'size': 10, 'color': '#4F77A3', 'symbol': 'circle'},  # 부드러운 파란색
+    '동물약국': {'size': 10, 'color': '#6BBE72', 'symbol': 'circle'},  # 부드러운 초록색
+    '카페': {'size': 10, 'color': '#D86B47', 'symbol': 'circle'},  # 부드러운 빨간색
+    '식당': {'size': 10, 'color': '#E79A47', 'symbol': 'circle'},  # 부드러운 주황색
+    '미용': {'size': 10, 'color': '#9B64B7', 'symbol': 'circle'},  # 부드러운 보라색
+    '반려동물용품': {'size': 10, 'color': '#F19BC1', 'symbol': 'circle'},  # 부드러운 분홍색
+    '위탁관리': {'size': 10, 'color': '#F1D354', 'symbol': 'circle'},  # 부드러운 노란색
+    '미술관': {'size': 10, 'color': '#67C6C2', 'symbol': 'circle'},  # 부드러운 시안색
+    '박물관': {'size': 10, 'color': '#C97EC9', 'symbol': 'circle'},  # 부드러운 마젠타색
+    '문예회관': {'size': 10, 'color': '#A8A8A8', 'symbol': 'circle'},  # 부드러운 회색
+    '여행지': {'size': 10, 'color': '#757575', 'symbol': 'circle'},  # 부드러운 검은색
+    '펜션': {'size': 10, 'color': '#A66E44', 'symbol': 'circle'},  # 부드러운 갈색
+    'default': {'size': 10, 'color': '#D0D0D0', 'symbol': 'circle'}  # 부드러운 회색
+}
+
+# hover 에 표시하는 (라벨, 컬럼) 순서
+HOVER_FIELDS = [
+    ('주소', '도로명주소'),
+    ('전화번호', '전화번호'),
+    ('운영시간', '운영시간'),
+    ('휴무일', '휴무일'),
+    ('주차 가능여부', '주차 가능여부'),
+    ('반려동물 동반 가능정보', '반려동물 동반 가능정보'),
+    ('반려동물 전용 정보', '반려동물 전용 정보'),
+    ('입장 가능 동물 크기', '입장 가능 동물 크기'),
+    ('반려동물 제한사항', '반려동물 제한사항'),
+    ('장소', '장소(실내) 여부'),
+    ('애견 동반 추가 요금', '애견 동반 추가 요금'),
+    ('기본 정보', '기본 정보_장소설명'),
+]
+assert [column for _, column in HOVER_FIELDS] == DETAIL_COLUMNS
+
+
+def _text(series):
+    return series.astype('string').fillna('')
+
+
+def format_hover(facilities_df):
+    """시설마다 지도 hover 에 보여줄 HTML 문자열을 벡터 연산으로 만든다."""
+    hover = ('<b>' + _text(facilities_df['시설명']) + '</b><br><br>'
+             + '카테고리: ' + _text(facilities_df['카테고리3']))
+    for label, column in HOVER_FIELDS:
+        hover = hover + '<br>' + label + ': ' + _text(facilities_df[column])
+    return hover.to_numpy(dtype=object)
+
+
+class FacilityIndex:
+    """자치구별 시설 마커 trace 색인.
+
+    facilities_df 에는 facilities.MAP_COLUMNS 가 있어야 한다.
+    """
+
+    def __init__(self, facilities_df):
+        # 각 구 안에서 카테고리가 처음 등장한 순서를 유지하며 (구, 카테고리3) 단위로 모은다
+        group = facilities_df.groupby(['시군구 명칭', '카테고리3'], observed=True, sort=False).ngroup()
+        order = np.argsort(group.to_numpy(), kind='stable')
+        self.order = order  # 정렬된 i 번째 행의 원래 행 위치
+        self._facilities = facilities_df
+        codes = group.to_numpy()[order]
+
+        self.lat = facilities_df['위도'].to_numpy()[order]
+        self.lon = facilities_df['경도'].to_numpy()[order]
+        # 경량 지도용 좌표: 소수 5자리(약 1 m)로 반올림해 JSON 길이를 줄인다
+        self.x = self.lon.astype('float64').round(5)
+        self.y = self.lat.astype('float64').round(5)
+
+        # 그룹 경계 → {구: [(카테고리, start, stop), ...]}
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        stops = np.r_[starts[1:], len(codes)]
+        gu = facilities_df['시군구 명칭'].astype(str).to_numpy()[order]
+        category = facilities_df['카테고리3'].astype(str).to_numpy()[order]
+        self.blocks = {}
+        for start, stop in zip(starts, stops):
+            self.blocks.setdefault(gu[start], []).append((category[start], start, stop))
+
+        self._hover = {}  # 구 -> {(start, stop): hover 문자열}
+        self._traces = {}
+
+    def _block_hover(self, gu):
+        if gu not in self._hover:
+            self._hover[gu] = {
+                (start, stop): format_hover(self._facilities.iloc[self.order[start:stop]])
+                for _, start, stop in self.blocks.get(gu, [])
+            }
+        return self._hover[gu]
+
+    def _trace(self, category, start, stop, hover, keep=slice(None)):
+        marker_style = MARKER_STYLES.get(category, MARKER_STYLES['default'])
+        return dict(
+            lat=self.lat[start:stop][keep],
+            lon=self.lon[start:stop][keep],
+            mode='markers',
+            marker=dict(
+                size=marker_style['size'],
+                symbol=marker_style['symbol'],  # 카테고리 기반 모양 설정
+                color=marker_style['color'],  # 카테고리 기반 색상 설정
+            ),
+            hovertext=hover[keep],
+            hoverinfo='text',
+            name=category,
+        )
+
+    def traces(self, gu, mask=None):
+        """구의 카테고리별 Scattermapbox 인자 목록. 시설이 없는 구는 빈 목록.
+
+        mask(facilities_df 행 위치 순서의 bool 배열)를 주면 True 인 시설만 담고,
+        남은 시설이 없는 카테고리는 뺀다.
+        """
+        hover = self._block_hover(gu)
+        if mask is None:
+            if gu not in self._traces:
+                self._traces[gu] = [self._trace(category, start, stop, hover[start, stop])
+                                    for category, start, stop in self.blocks.get(gu, [])]
+            return self._traces[gu]
+        traces = []
+        for category, start, stop in self.blocks.get(gu, []):
+            keep = mask[self.order[start:stop]]
+            if keep.any():
+                traces.append(self._trace(category, start, stop, hover[start, stop], keep))
+        return traces
+
+    def count(self, gu, mask=None):
+        """구의 시설 수 (mask 를 주면 True 인 시설만)."""
+        blocks = self.blocks.get(gu, [])
+        if mask is None:
+            return sum(stop - start for _, start, stop in blocks)
+        return sum(int(mask[self.order[start:stop]].sum()) for _, start, stop in blocks)
+
+    def coordinates(self, gu, mask=None):
+        """구 시설의 (경도, 위도, 카테고리 번호, 카테고리 목록). 카테고리 번호는 카테고리 목록의 위치이다."""
+        blocks = self.blocks.get(gu, [])
+        categories = list(dict.fromkeys(category for category, _, _ in blocks))
+        rows = np.concatenate([np.arange(start, stop) for _, start, stop in blocks] or [np.empty(0, dtype=np.int64)])
+        codes = np.repeat([categories.index(category) for category, _, _ in blocks],
+                          [stop - start for _, start, stop in blocks]).astype(np.int64)
+        if mask is not None:
+            keep = mask[self.order[rows]]
+            rows, codes = rows[keep], codes[keep]
+        return self.lon[rows], self.lat[rows], codes, categories
+
+    def points(self, gu, mask=None):
+        """구의 카테고리별 (카테고리, DataFrame) 목록. DataFrame 은 경도 x, 위도 y, 원래 행 위치 i 만 담는다.
+
+        mask 는 traces 와 같다.
+        """
+        points = []
+        for category, start, stop in self.blocks.get(gu, []):
+            keep = slice(None) if mask is None else mask[self.order[start:stop]]
+            rows = self.order[start:stop][keep]
+            if len(rows):
+                points.append((category, pd.DataFrame({
+                    'x': self.x[start:stop][keep],
+                    'y': self.y[start:stop][keep],
+                    'i': rows,
+                })))
+        return points
+
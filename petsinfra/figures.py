@@ -0,0 +1,447 @@
+"""EDA 페이지의 그래프와 지도.
+
+그래프는 그 그래프가 쓰는 입력 파일의 버전마다 한 번만 만들어 모든 세션이 공유한다.
+(seoul_pop.csv 가 바뀌면 인구 관련 그래프만 다시 만든다, EDA_FIGURES/DECK_INPUTS 참고)
+pydeck 지도(FrozenDeck)는 직렬화된 JSON 까지 보관하므로 재실행이나 3D 토글 때 다시 직렬화하지
+않는다. plotly 그래프는 Figure 로 캐시하고 st.plotly_chart 가 재실행마다 직렬화한다 (EDA 페이지
+전체에 수 ms). 접근성 지도는 (카테고리, 감쇠 거리) 조합마다 한 번 만든다.
+``python -m petsinfra.snapshots`` 로 내보낸 스냅샷이 현재 입력과 코드 버전에 맞으면 데이터로
+그래프를 만들지 않고 스냅샷에서 읽는다 (기본 화면 기준, snapshot_builders 참고). 스냅샷은 그래프를
+만드는 단계를 건너뛸 뿐, plotly 그래프의 재실행별 직렬화는 그대로다.
+"""
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+
+from petsinfra import loader, profiling, raster, snapshots
+
+COLOR_SCALE = [
+    [0, 'rgb(28, 89, 60)'],  # 첫 색상 (기준 색상)
+    [1, 'rgb(210, 245, 115)']  # 두 번째 색상 (변경될 색상)
+]
+CATEGORY_COLORS = [
+    'rgb(68, 128, 63)',  # 첫 번째 색상
+    'rgb(89, 168, 83)',  # 두 번째 색상
+    'rgb(255, 139, 73)',  # 세 번째 색상
+    'rgb(255, 205, 74)'  # 네 번째 색상
+]
+# 접근성 지수 색상: log2(지수) -2(¼) ~ 2(4배), 부족한 곳은 빨간색, 평균은 흰색
+ACCESS_COLOR_SCALE = [
+    [0, '#c0392b'],
+    [0.5, '#f7f7f7'],
+    [1, '#08a89a'],
+]
+ACCESS_TICKS = {-2: '¼', -1: '½', 0: '1', 1: '2', 2: '4'}
+ACCESS_INPUTS = ('geo', 'pets', 'facilities')
+# EDA 페이지 접근성 위젯의 기본값 (카테고리, 감쇠 거리 m). 이 조합만 스냅샷으로 내보낸다
+ACCESS_DEFAULT = (('동물병원',), 1000)
+
+# 지도 지표: 색상/높이에 쓰는 정규화 컬럼
+DECK_METRICS = {
+    '인구수': '정규화인구',
+    '반려동물': '정규화반려동물',
+}
+# (지표, 3D 여부)별 표시 설정. name 은 스냅샷 이름, tooltip 은 (라벨, 컬럼) 목록
+DECK_VARIANTS = {
+    ('인구수', True): dict(name='population_deck_3d', opacity=0.8, highlight_color=[255, 202, 67, 150],
+                         tooltip=[('자치구', 'sggnm'), ('인구수', '인구수')]),
+    ('인구수', False): dict(name='population_deck_2d', opacity=1, highlight_color=[255, 202, 67, 255],
+                          tooltip=[('자치구', 'sggnm'), ('인구수', '인구수')]),
+    ('반려동물', True): dict(name='pets_deck_3d', opacity=0.6, highlight_color=[255, 202, 67, 150],
+                         tooltip=[('자치구', 'sggnm'), ('인구 수', '인구수')]),
+    ('반려동물', False): dict(name='pets_deck_2d', opacity=0.8, highlight_color=[255, 202, 67, 50],
+                          tooltip=[('자치구', 'sggnm'), ('반려동물 등록 수', '등록수')]),
+}
+
+
+@profiling.timed
+def ranked_bar(df, x, y, labels, template, texttemplate='%{text:.2s}'):
+    """값이 큰 순서로 정렬한 자치구별 막대그래프."""
+    df_sorted = df.sort_values(by=y, ascending=False)
+    bar = px.bar(
+        df,
+        x=x,
+        y=y,
+        labels=labels,
+        text=y,  # 바에 표시될 텍스트
+        template=template,
+        category_orders={x: df_sorted[x]},  # 높은 순으로 정렬된 순서 적용
+        color=y,  # 값에 따라 색상이 변하게 설정
+        color_continuous_scale=COLOR_SCALE,
+    )
+    bar.update_traces(texttemplate=texttemplate, textposition='outside')
+    return bar
+
+
+@profiling.timed
+def infra_pie(metrics):
+    """서울 전체 중분류(카테고리2) 분포."""
+    return px.pie(
+        values=metrics.city('카테고리2'),
+        names=metrics.categories['카테고리2'],
+        color_discrete_sequence=CATEGORY_COLORS,
+    )
+
+
+@profiling.timed
+def gu_infra_bar(metrics):
+    # 구 × 중분류 시설 수 ('카테고리2' 컬럼을 '중분류'로 이름 변경)
+    grouped = metrics.frame('카테고리2', district_column='시군구 명칭').rename(columns={'카테고리2': '중분류'})
+
+    # 서울 전체 시설 수가 많은 중분류부터 정렬
+    city = metrics.city('카테고리2')
+    category_order = metrics.categories['카테고리2'][np.argsort(-city, kind='stable')].tolist()
+
+    return px.bar(
+        grouped,
+        x="시군구 명칭",
+        y="count",
+        color="중분류",
+        labels={"count": "개수", "시군구 명칭": "자치구"},
+        color_discrete_sequence=CATEGORY_COLORS,
+        barmode="group",  # 그룹으로 막대 그래프 표시
+        category_orders={"중분류": category_order}  # 카테고리 정렬 적용
+    )
+
+
+@profiling.timed
+def ratio_pies(metrics):
+    """인프라당 반려동물 비율 상위 2개 구와 하위 2개 구의 중분류 파이 차트."""
+    ratio = metrics.pets_per_facility()
+
+    # 인프라당 반려동물 비율이 높은 상위 2개의 구 선택 (비율이 높을수록 인프라 부족)
+    top_2_cities_based_on_ratio = metrics.top_k(ratio, 2)
+
+    # 인프라당 반려동물 비율이 낮은 하위 2개의 구 선택 (비율이 낮을수록 인프라 충분)
+    bottom_2_cities_based_on_ratio = metrics.top_k(ratio, 2, largest=False)
+
+    # 상위 및 하위 구를 하나의 리스트로 합침
+    selected_cities_based_on_ratio = top_2_cities_based_on_ratio + bottom_2_cities_based_on_ratio
+
+    # 2x2 서브플롯 생성, 각 셀의 타입을 'domain'으로 지정
+    top_fig = make_subplots(
+        rows=2, cols=2,
+        specs=[[{'type': 'domain'}, {'type': 'domain'}],
+               [{'type': 'domain'}, {'type': 'domain'}]],
+        subplot_titles=selected_cities_based_on_ratio
+    )    # 각 구별로 파이 차트 생성 및 추가
+    row_col_positions = [(1, 1), (1, 2), (2, 1), (2, 2)]
+    for i, city in enumerate(selected_cities_based_on_ratio):
+        # 파이 차트 추가 (구의 중분류별 시설 수는 행렬의 한 행)
+        pie_chart = go.Pie(
+            labels=metrics.categories['카테고리2'],
+            values=metrics.row(city, '카테고리2'),
+            name=city,
+            hole=0.3,
+            marker=dict(
+                colors=[
+                    'rgb(89, 168, 83)',  # 반려의료
+                    'rgb(255, 205, 74)',  # 반려동물 서비스
+                    'rgb(255, 139, 73)',  # 반려동반여행
+                    'rgb(68, 128, 63)'  # 반려동식당카
+                ]
+            )
+        )
+
+        top_fig.add_trace(pie_chart, row=row_col_positions[i][0], col=row_col_positions[i][1])
+
+    # 레이아웃 설정
+    top_fig.update_layout(showlegend=True)
+    return top_fig
+
+
+@profiling.timed
+def metric_deck(seoul_gdf_map, metric, extruded):
+    """자치구 지표(인구수/반려동물) 지도. 레이어 데이터는 표시에 쓰는 컬럼만 남긴다."""
+    value = DECK_METRICS[metric]
+    variant = DECK_VARIANTS[(metric, extruded)]
+    tooltip_columns = [column for _, column in variant['tooltip']]
+    columns = list(dict.fromkeys(['geometry', value, *tooltip_columns]))
+
+    return pdk.Deck(
+        layers=[
+            pdk.Layer(
+                "GeoJsonLayer",
+                seoul_gdf_map[columns],
+                get_fill_color=f"""
+                    [
+                        (210 + (28 - 210) * {value}), 
+                        (245 + (89 - 245) * {value}), 
+                        (115 + (60 - 115) * {value})
+                    ]
+                """,  # 지표에 따라 색상 계산
+                get_elevation=f"{value} * 1000",  # 지표에 비례하여 높이 설정 (1000은 배율)
+                elevation_scale=5,  # 높이의 배율 설정
+                extruded=extruded,  # 3D 효과 활성화
+                auto_highlight=True,
+                highlight_color=variant['highlight_color'],
+                opacity=variant['opacity'],
+                pickable=True,  # 인터랙션 활성화
+            ),
+        ],
+        initial_view_state=pdk.ViewState(
+            latitude=37.563383,
+            longitude=126.996039,
+            zoom=9,
+            pitch=45,  # 지도 기울기 설정
+            bearing=0,  # 회전 각도 설정
+        ),
+        tooltip=deck_tooltip(metric, extruded),
+        map_style="light",
+    )
+
+
+def deck_tooltip(metric, extruded):
+    """metric_deck 지도의 tooltip 설정."""
+    return {
+        "html": "".join(f"<b>{label}:</b> {{{column}}}<br>"
+                        for label, column in DECK_VARIANTS[(metric, extruded)]['tooltip']),
+        "style": {"backgroundColor": "darkorange", "color": "white"},
+    }
+
+
+@profiling.timed
+def accessibility_map(scores, categories, gu_geojson, gu_names):
+    """접근성 지수 격자 이미지 위에 자치구 경계를 그린 지도."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        level = np.log2(scores.index(categories))
+    image = raster.colorize(level, scores.grid.bounds, ACCESS_COLOR_SCALE, -2, 2)
+
+    fig = go.Figure(go.Choroplethmapbox(
+        geojson=gu_geojson,
+        locations=gu_names,
+        z=[0] * len(gu_names),
+        colorscale=[[0, 'rgba(0,0,0,0)'], [1, 'rgba(0,0,0,0)']],
+        showscale=False,
+        marker_line=dict(width=1, color='#555555'),
+        hovertemplate="%{location}<extra></extra>",
+        name='자치구',
+    ))
+    # 이미지 레이어에는 범례가 없으므로 색 막대만 보여주는 빈 trace 를 둔다
+    fig.add_trace(go.Scattermapbox(
+        lat=[None], lon=[None], mode='markers', hoverinfo='skip', showlegend=False,
+        marker=dict(
+            color=[-2, 2], colorscale=ACCESS_COLOR_SCALE, cmin=-2, cmax=2,
+            colorbar=dict(title='접근성 지수', thickness=12,
+                          tickvals=list(ACCESS_TICKS), ticktext=list(ACCESS_TICKS.values())),
+        ),
+    ))
+    fig.update_layout(
+        mapbox_style="carto-positron",
+        mapbox=dict(center=dict(lat=37.563383, lon=126.996039), zoom=9.5),
+        mapbox_layers=[image.mapbox_layer()],
+        margin={"r": 0, "t": 0, "l": 0, "b": 0},
+    )
+    return fig
+
+
+class FrozenDeck:
+    """직렬화를 마친 pydeck.Deck. st.pydeck_chart 에 Deck 대신 넘길 수 있다.
+
+    Deck.to_json() 은 들여쓰기된 JSON 을 만들므로 공백 없이 다시 직렬화해 둔다.
+    """
+
+    def __init__(self, deck):
+        with profiling.span('figures.serialize_deck'):
+            self._json = json.dumps(json.loads(deck.to_json()), ensure_ascii=False, separators=(',', ':'))
+        self._tooltip = deck._tooltip
+
+    @classmethod
+    def from_json(cls, spec, tooltip):
+        """이미 직렬화된 JSON(스냅샷)으로 만든다."""
+        frozen = cls.__new__(cls)
+        frozen._json = spec
+        frozen._tooltip = tooltip
+        return frozen
+
+    def to_json(self):
+        return self._json
+
+
+def _population_bar():
+    return ranked_bar(loader.load_population(), '동별', '인구수',
+                      {'동별': '자치구', '인구수': '인구 수'}, 'plotly')
+
+
+def _pets_bar():
+    return ranked_bar(loader.load_pets(), 'sggnm', '등록수',
+                      {'sggnm': '자치구', '등록수': '등록수'}, 'plotly_white')
+
+
+def _infra_bar():
+    metrics = loader.load_district_metrics()
+    infra_count = pd.DataFrame({'sggnm': metrics.districts, '인프라개수': metrics.total})
+    return ranked_bar(infra_count.sort_values(by='인프라개수', ascending=False), 'sggnm', '인프라개수',
+                      {'sggnm': '자치구', '등록수': '등록 수'}, 'plotly_white')
+
+
+def _petsbyinfra_bar():
+    metrics = loader.load_district_metrics()
+    petsbyinfra = pd.DataFrame({'sggnm': metrics.districts, '인프라당반려동물': metrics.pets_per_facility()})
+    petsbyinfra_sorted = petsbyinfra.sort_values(by='인프라당반려동물', ascending=False)
+    return ranked_bar(petsbyinfra_sorted, 'sggnm', '인프라당반려동물',
+                      {'sggnm': '자치구', '등록수': '등록 수'}, 'plotly_white',
+                      texttemplate='%{text:.3s}')
+
+
+# EDA 그래프: 이름 -> (사용하는 입력, 만드는 함수). 입력 이름은 loader.INPUTS 의 키
+EDA_FIGURES = {
+    'population_bar': (('population',), _population_bar),
+    'pets_bar': (('pets',), _pets_bar),
+    'infra_bar': (('geo', 'facilities'), _infra_bar),
+    'infra_pie': (('geo', 'facilities'), lambda: infra_pie(loader.load_district_metrics())),
+    'gu_infra_bar': (('geo', 'facilities'), lambda: gu_infra_bar(loader.load_district_metrics())),
+    'petsbyinfra_bar': (('geo', 'pets', 'facilities'), _petsbyinfra_bar),
+    'ratio_pies': (('geo', 'pets', 'facilities'), lambda: ratio_pies(loader.load_district_metrics())),
+}
+# 지도 지표별 사용하는 입력 (경계, 정규화 컬럼, 툴팁 컬럼)
+DECK_INPUTS = {
+    '인구수': ('geo', 'population'),
+    '반려동물': ('geo', 'population', 'pets'),
+}
+
+
+def input_keys(inputs):
+    """입력 이름 목록의 현재 캐시 키 묶음."""
+    snapshot = loader.snapshot()
+    return tuple(snapshot.key(name) for name in inputs)
+
+
+def _read_figure(spec):
+    with profiling.span('figures.read_snapshot'):
+        return pio.from_json(spec)
+
+
+@profiling.cache_resource(max_entries=2 * len(EDA_FIGURES))
+def _eda_figure(name, keys):
+    spec = snapshots.read(name, keys)
+    if spec is not None:
+        return _read_figure(spec)
+    return EDA_FIGURES[name][1]()
+
+
+def eda_figures():
+    """EDA 페이지의 plotly 그래프 {이름: Figure}."""
+    return {
+        name: _eda_figure(name, input_keys(inputs))
+        for name, (inputs, _) in EDA_FIGURES.items()
+    }
+
+
+def _metric_deck(metric, extruded):
+    return metric_deck(loader.load_merged(zoom=9), metric, extruded)
+
+
+@profiling.cache_resource(max_entries=2 * len(DECK_VARIANTS))
+def _eda_deck(keys, metric, extruded):
+    spec = snapshots.read(DECK_VARIANTS[(metric, extruded)]['name'], keys)
+    if spec is not None:
+        return FrozenDeck.from_json(spec, deck_tooltip(metric, extruded))
+    return FrozenDeck(_metric_deck(metric, extruded))
+
+
+def eda_deck(metric, extruded):
+    """EDA 페이지의 자치구 지표 지도 (직렬화된 상태로 캐시)."""
+    return _eda_deck(input_keys(DECK_INPUTS[metric]), metric, extruded)
+
+
+@profiling.timed
+def underserved_dongs(scores, categories, n=10):
+    """접근성 지수가 가장 낮은 n 개 행정동 표."""
+    return (scores.dong_scores(categories)
+            .nsmallest(n, '접근성지수')
+            .rename(columns={'sggnm': '자치구', '접근성지수': '접근성 지수', '추정반려동물수': '추정 반려동물 수'})
+            [['자치구', '행정동', '접근성 지수', '추정 반려동물 수']])
+
+
+def _accessibility_map(categories, bandwidth_m):
+    gu_geojson = loader.load_seoul_gu_geojson(9)
+    return accessibility_map(loader.load_accessibility(bandwidth_m), list(categories),
+                             gu_geojson, [feature['id'] for feature in gu_geojson['features']])
+
+
+def _read_table(text):
+    return pd.read_json(io.StringIO(text), orient='split')
+
+
+@profiling.cache_resource(max_entries=32)
+def _accessibility_view(keys, categories, bandwidth_m):
+    if (categories, bandwidth_m) == ACCESS_DEFAULT:
+        spec = snapshots.read('accessibility_map', keys)
+        table = snapshots.read('underserved_dongs', keys)
+        if spec is not None and table is not None:
+            return _read_figure(spec), _read_table(table)
+    return (_accessibility_map(categories, bandwidth_m),
+            underserved_dongs(loader.load_accessibility(bandwidth_m), list(categories)))
+
+
+def accessibility_view(categories, bandwidth_m):
+    """EDA 페이지의 접근성 지도(Figure)와 접근성이 낮은 행정동 표. categories 가 비어 있으면 전체."""
+    return _accessibility_view(input_keys(ACCESS_INPUTS), tuple(categories), bandwidth_m)
+
+
+@profiling.cache_resource(max_entries=2)
+def _accessibility_categories(keys):
+    text = snapshots.read('accessibility_categories', keys)
+    if text is not None:
+        return json.loads(text)
+    return loader.load_accessibility(ACCESS_DEFAULT[1]).categories
+
+
+def accessibility_categories():
+    """접근성 지도에서 고를 수 있는 카테고리3 목록."""
+    return _accessibility_categories(input_keys(ACCESS_INPUTS))
+
+
+def _plotly_snapshot(build):
+    def render():
+        figure = build()
+        return pio.to_json(figure, validate=False), figure.to_html(include_plotlyjs='cdn', full_html=True)
+    return render
+
+
+def _deck_snapshot(metric, extruded):
+    def render():
+        deck = _metric_deck(metric, extruded)
+        return FrozenDeck(deck).to_json(), deck.to_html(as_string=True, notebook_display=False)
+    return render
+
+
+def _underserved_snapshot():
+    categories, bandwidth_m = ACCESS_DEFAULT
+    table = underserved_dongs(loader.load_accessibility(bandwidth_m), list(categories))
+    return table.to_json(orient='split', index=False, force_ascii=False), None
+
+
+def _categories_snapshot():
+    return json.dumps(loader.load_accessibility(ACCESS_DEFAULT[1]).categories, ensure_ascii=False), None
+
+
+def snapshot_builders():
+    """스냅샷 목록 [(이름, 사용하는 입력, 만드는 함수)]. 함수는 (JSON 문자열, HTML 문자열 또는 None)을 반환한다.
+
+    EDA 페이지의 기본 화면(3D 토글 두 상태 모두, 접근성은 ACCESS_DEFAULT)에 쓰이는 것을 모두 담는다.
+    """
+    builders = [(name, inputs, _plotly_snapshot(build)) for name, (inputs, build) in EDA_FIGURES.items()]
+    builders += [(variant['name'], DECK_INPUTS[metric], _deck_snapshot(metric, extruded))
+                 for (metric, extruded), variant in DECK_VARIANTS.items()]
+    builders += [
+        ('accessibility_map', ACCESS_INPUTS, _plotly_snapshot(lambda: _accessibility_map(*ACCESS_DEFAULT))),
+        ('underserved_dongs', ACCESS_INPUTS, _underserved_snapshot),
+        ('accessibility_categories', ACCESS_INPUTS, _categories_snapshot),
+    ]
+    return builders
+
+
+def invalidate():
+    _eda_figure.clear()
+    _eda_deck.clear()
+    _accessibility_view.clear()
+    _accessibility_categories.clear()
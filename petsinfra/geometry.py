@@ -0,0 +1,98 @@
+"""행정동 경계로부터 자치구 경계를 만들고, 줌 레벨별 단순화 경계(LOD)를 만드는 기하 연산."""
+import json
+import math
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+# 단순화 경계를 미리 만들어 두는 줌 레벨 (EDA 지도 9, create_map 8/10/11)
+LOD_ZOOMS = (8, 9, 10, 11)
+# 행정동 경계는 구를 선택했을 때(create_map 줌 11)만 그리므로 한 단계만 만든다
+DONG_LOD_ZOOM = 11
+
+
+def dissolve_gu(seoul_gdf):
+    """425개 행정동을 25개 자치구로 병합하고 중심 좌표를 붙인다.
+
+    반환값의 index 는 'sggnm' 이며 'center_lat'/'center_lon' 컬럼을 포함한다.
+    """
+    seoul_gu_gdf = seoul_gdf.dissolve(by='sggnm')
+    center = seoul_gu_gdf.geometry.centroid
+    seoul_gu_gdf['center_lat'] = center.y
+    seoul_gu_gdf['center_lon'] = center.x
+    return seoul_gu_gdf
+
+
+def to_geojson(gdf):
+    """GeoDataFrame 을 응답에 그대로 쓸 수 있는 GeoJSON 문자열로 변환한다."""
+    return gdf.to_json(ensure_ascii=False)
+
+
+def load_geojson(text):
+    return json.loads(text)
+
+
+def tolerance_for_zoom(zoom):
+    """해당 줌에서 화면 0.5픽셀에 해당하는 경도 폭 (mapbox 512px 타일 기준)."""
+    return 360 / (512 * 2 ** zoom) * 0.5
+
+
+def decimals_for_zoom(zoom):
+    """좌표를 남길 소수 자릿수. 단순화 허용 오차의 1/4 보다 촘촘한 격자로 양자화한다."""
+    return math.ceil(-math.log10(tolerance_for_zoom(zoom) / 4))
+
+
+def lod_zoom(zoom):
+    """요청한 줌을 표현하기에 충분한 LOD 단계. 가장 세밀한 단계보다 크면 None(원본)."""
+    for lod in LOD_ZOOMS:
+        if zoom <= lod:
+            return lod
+    return None
+
+
+def simplify_coverage(geoms, tolerance):
+    """인접 폴리곤 사이에 틈이나 겹침이 생기지 않도록 단순화한다.
+
+    경계선을 폴리곤끼리 공유하는 구간(arc) 단위로 나누어 각 구간을 한 번만
+    단순화한 뒤 다시 면으로 조립하므로, 이웃한 두 폴리곤은 항상 같은 선을 공유한다.
+    """
+    geoms = np.asarray(geoms)
+    lines = shapely.union_all(shapely.boundary(geoms))
+    arcs = shapely.get_parts(shapely.line_merge(lines))
+    arcs = shapely.simplify(arcs, tolerance, preserve_topology=True)
+    faces = shapely.get_parts(shapely.polygonize(arcs))
+
+    # 조립된 각 면이 원래 어느 폴리곤에 속하는지 찾아 다시 묶는다
+    tree = shapely.STRtree(geoms)
+    face_idx, geom_idx = tree.query(shapely.point_on_surface(faces), predicate='intersects')
+    face_idx, first = np.unique(face_idx, return_index=True)
+    geom_idx = geom_idx[first]
+    return np.array([
+        shapely.union_all(faces[face_idx[geom_idx == i]]) for i in range(len(geoms))
+    ], dtype=object)
+
+
+def quantize(geoms, decimals):
+    """좌표를 소수 decimals 자리 격자에 맞춘다. 공유 꼭짓점은 같은 값으로 반올림된다."""
+    geoms = shapely.set_precision(np.asarray(geoms), 10 ** -decimals)
+    return shapely.transform(geoms, lambda coords: np.round(coords, decimals))
+
+
+def dong_lod(seoul_gdf):
+    """행정동 경계(index: adm_cd)를 DONG_LOD_ZOOM 에 맞게 단순화한 GeoDataFrame (sggnm, adm_nm 포함).
+
+    서울 전체 행정동을 한 번에 단순화하므로 구 경계를 사이에 둔 동끼리도 틈이 생기지 않는다.
+    """
+    tier = build_lod(seoul_gdf, zooms=(DONG_LOD_ZOOM,))[DONG_LOD_ZOOM]
+    return gpd.GeoDataFrame(seoul_gdf[['sggnm', 'adm_nm']], geometry=tier)
+
+
+def build_lod(gdf, zooms=LOD_ZOOMS):
+    """zooms 각 단계의 단순화 + 양자화된 경계. {zoom: GeoSeries(index 는 gdf 와 동일)}"""
+    tiers = {}
+    for zoom in zooms:
+        geoms = simplify_coverage(gdf.geometry.values, tolerance_for_zoom(zoom))
+        geoms = quantize(geoms, decimals_for_zoom(zoom))
+        tiers[zoom] = gpd.GeoSeries(geoms, index=gdf.index, crs=gdf.crs)
+    return tiers
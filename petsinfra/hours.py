@@ -0,0 +1,237 @@
+"""운영시간/휴무일 문자열을 주간 영업 구간 배열로 바꾼 색인.
+
+'월~금 09:00~19:00, 토 09:00~14:00' 같은 운영시간과 '매주 일요일, 법정공휴일',
+'2, 4째주 일요일' 같은 휴무일을 적재 시 한 번 해석해 둔다. 같은 문자열은 한 번만 해석하고
+(서로 다른 값은 시설 수보다 훨씬 적다) 결과를 행 단위 배열로 펼친다.
+
+- 영업 구간: 월요일 0시부터의 분(minute-of-week) [start, end) 배열과 그 구간의 시설 행 번호.
+  자정을 넘는 구간은 다음 날로 나누어 넣는다.
+- 휴무: 시설 × 요일의 주차(1~5째 주, 마지막 주) 비트마스크와 법정공휴일 휴무 여부.
+  '마지막 주'는 그 날짜에서 7일 뒤가 다음 달인 주이다. '격주'처럼 날짜를 정할 수 없는 휴무는 반영하지 않는다.
+- 법정공휴일 운영시간이 따로 있으면 공휴일 구간 배열에 넣는다.
+
+``open_at(when)`` 은 배열 비교 몇 번으로 그 시각에 영업 중인 시설을 구한다.
+운영시간을 해석하지 못한 시설('정보없음' 등)은 known 이 False 이며 영업 중으로 보지 않는다.
+"""
+import re
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['운영시간', '휴무일']
+DAYS = '월화수목금토일'
+MINUTES_PER_DAY = 24 * 60
+ALL_WEEKS = 0b11111  # 1~5째 주
+LAST_WEEK = 1 << 5  # 마지막 주
+
+_HOLIDAY = '법정공휴일'
+_TIME_RANGE = re.compile(r'(\d{1,2}):(\d{1,2})\s*~\s*(\d{1,2}):(\d{1,2})')
+# 다른 한글과 붙어 있지 않은 요일 글자 (예: '일반진료'의 '일'은 제외), '월~금' 처럼 범위일 수 있다
+_DAY_TOKEN = re.compile(r'(?<![가-힣])([월화수목금토일])(?:\s*~\s*([월화수목금토일]))?(?![가-힣])')
+# 시간 바로 뒤의 '(금 21:00)': 그 요일만 닫는 시각이 다르다 (여는 시각은 같다)
+_DAY_EXCEPTION = re.compile(
+    r'\s*\(\s*([월화수목금토일])(?:\s*~\s*([월화수목금토일]))?(?:요일)?\s*(\d{1,2}):(\d{1,2})\s*(?:까지)?\s*\)'
+)
+_PARENTHESIS = re.compile(r'\([^)]*\)')
+_DATE = re.compile(r'\d+\s*월\s*\d+\s*일')
+_CLOSED_TOKEN = re.compile(
+    r'(?P<weeks>\d(?:\s*,\s*\d)*)\s*째\s*주|(?P<last>마지막\s*주?)|(?P<every>매주)|(?P<biweekly>격주)|'
+    + _DAY_TOKEN.pattern
+)
+
+
+def _day_range(first, last=None):
+    """'월'~'금' → [0, 1, 2, 3, 4]. '토~월' 처럼 주를 넘는 범위도 처리한다."""
+    start = DAYS.index(first)
+    stop = start if last is None else DAYS.index(last)
+    return [(start + i) % 7 for i in range((stop - start) % 7 + 1)]
+
+
+def _days(text):
+    days = []
+    for first, last in _DAY_TOKEN.findall(text):
+        days.extend(_day_range(first, last or None))
+    return days
+
+
+def _minute(hour, minute):
+    # '19:3' 처럼 한 자리로 적힌 분은 10분 단위로 본다
+    minute = int(minute) * 10 if len(minute) == 1 else int(minute)
+    return int(hour) * 60 + minute
+
+
+def parse_hours(text):
+    """운영시간 문자열 → (주간 구간 [(요일, 시작 분, 끝 분)], 공휴일 구간 [(시작 분, 끝 분)]).
+
+    시간 앞에 적힌 요일에 그 시간을 적용한다. 요일이 없으면 앞 구간의 요일을, 첫 구간이면
+    매일로 본다. 끝 시각이 시작 시각보다 이르면(00:00 포함) 자정을 넘는 것으로 본다.
+    '월~목, 토 09:00~19:00(금 21:00)' 처럼 시간 뒤 괄호의 요일은 같은 시각에 열고 괄호의 시각에
+    닫는다. 해석할 수 있는 시간이 없거나, 그 밖의 괄호 안에 요일/시각이 있으면(잘못된 일정을
+    만들지 않도록) None.
+    """
+    if any(_DAY_TOKEN.search(p) or ':' in p for p in _PARENTHESIS.findall(_DAY_EXCEPTION.sub('', text))):
+        return None
+    weekly, holiday = [], []
+    days = list(range(7))
+    position = 0
+    for match in _TIME_RANGE.finditer(text):
+        segment = text[position:match.start()].replace('요일', '')
+        position = match.end()
+        is_holiday = _HOLIDAY in segment
+        segment = segment.replace(_HOLIDAY, '')
+        if '매일' in segment:
+            days = list(range(7))
+        elif _DAY_TOKEN.search(segment):
+            days = _days(segment)
+        elif is_holiday:
+            days = []
+
+        start = _minute(match.group(1), match.group(2))
+        end = _minute(match.group(3), match.group(4))
+        if end <= start:
+            end += MINUTES_PER_DAY
+        intervals = [(day, start, end) for day in days]
+        while True:
+            exception = _DAY_EXCEPTION.match(text, position)
+            if exception is None:
+                break
+            position = exception.end()
+            changed = _day_range(exception.group(1), exception.group(2))
+            close = _minute(exception.group(3), exception.group(4))
+            if close <= start:
+                close += MINUTES_PER_DAY
+            intervals = [item for item in intervals if item[0] not in changed]
+            intervals.extend((day, start, close) for day in changed)
+        weekly.extend(intervals)
+        if is_holiday:
+            holiday.append((start, min(end, MINUTES_PER_DAY)))
+    if position == 0:
+        return None
+    return weekly, holiday
+
+
+def parse_closed(text):
+    """휴무일 문자열 → (요일별 휴무 주차 비트마스크 7개, 법정공휴일 휴무 여부).
+
+    '매주'(또는 주차 표기가 없는 요일)는 모든 주, '2, 4째주'는 그 주에만, '마지막(주)'는 그 달의
+    마지막 주(LAST_WEEK)에만 쉰다.
+    '격주'처럼 날짜를 알 수 없는 휴무와 '1월1일', '설', '추석' 같은 특정 날짜는 반영하지 않는다.
+    """
+    weeks_by_day = [0] * 7
+    text = _DATE.sub(' ', text).replace('요일', '')
+    closed_on_holiday = _HOLIDAY in text
+    text = text.replace(_HOLIDAY, ' ')
+    weeks = ALL_WEEKS
+    for match in _CLOSED_TOKEN.finditer(text):
+        if match.group('weeks'):
+            weeks = sum(1 << (int(w) - 1) for w in re.findall(r'\d', match.group('weeks')) if 1 <= int(w) <= 5)
+        elif match.group('last'):
+            weeks = LAST_WEEK
+        elif match.group('every'):
+            weeks = ALL_WEEKS
+        elif match.group('biweekly'):
+            weeks = 0
+        else:
+            first, last = match.group(5), match.group(6)
+            for day in _day_range(first, last):
+                weeks_by_day[day] |= weeks
+    return weeks_by_day, closed_on_holiday
+
+
+def _week_bits(when):
+    """when 의 날짜가 속한 주차 비트 (n째 주, 그 달의 마지막 주이면 LAST_WEEK 도)."""
+    bits = 1 << (when.day - 1) // 7
+    if (when + timedelta(days=7)).month != when.month:
+        bits |= LAST_WEEK
+    return bits
+
+
+def _expand(codes, counts):
+    """값(unique)별 항목 수 counts 와 행별 값 번호 codes → 항목마다 (행 번호, 값 안에서의 항목 번호)."""
+    per_row = counts[codes]
+    rows = np.repeat(np.arange(len(codes)), per_row)
+    offsets = np.cumsum(per_row) - per_row
+    return rows, np.arange(len(rows)) - offsets[rows]
+
+
+def _flatten(parsed_lists):
+    """값별 항목 목록 → (값별 항목 수, 값별 시작 위치, 모든 항목을 이어 붙인 배열)."""
+    counts = np.array([len(items) for items in parsed_lists] + [0], dtype=np.int64)
+    starts = np.cumsum(counts) - counts
+    items = [item for items in parsed_lists for item in items]
+    return counts, starts, items
+
+
+class OpeningHours:
+    """시설별 주간 영업 구간 색인. 행 번호는 facilities_df 의 행 위치(iloc)와 같다.
+
+    facilities_df 에는 COLUMNS 가 있어야 한다.
+    """
+
+    def __init__(self, facilities_df):
+        self.size = len(facilities_df)
+
+        codes, uniques = pd.factorize(facilities_df['운영시간'])
+        parsed = [parse_hours(str(value)) for value in uniques]
+        self.known = np.append([p is not None for p in parsed], False)[codes]
+
+        # 주간 구간: 자정을 넘는 구간은 [시작, 24시) 와 다음 날 [0시, 끝) 으로 나눈다
+        weekly = []
+        for p in parsed:
+            intervals = []
+            for day, start, end in (p[0] if p else []):
+                base = day * MINUTES_PER_DAY
+                intervals.append((day, base + start, base + min(end, MINUTES_PER_DAY)))
+                if end > MINUTES_PER_DAY:
+                    next_base = (day + 1) % 7 * MINUTES_PER_DAY
+                    intervals.append((day, next_base, next_base + end - MINUTES_PER_DAY))
+            weekly.append(intervals)
+        counts, starts, items = _flatten(weekly)
+        items = np.array(items, dtype=np.int32).reshape(-1, 3)
+        rows, item = _expand(codes, counts)
+        index = starts[codes[rows]] + item
+        self.owner = rows.astype(np.int32)
+        self.day = items[index, 0].astype(np.int8)  # 구간이 시작된 요일 (휴무 확인용)
+        self.start = items[index, 1]
+        self.end = items[index, 2]
+
+        counts, starts, items = _flatten([p[1] if p else [] for p in parsed])
+        items = np.array(items, dtype=np.int32).reshape(-1, 2)
+        rows, item = _expand(codes, counts)
+        index = starts[codes[rows]] + item
+        self.holiday_owner = rows.astype(np.int32)
+        self.holiday_start = items[index, 0]
+        self.holiday_end = items[index, 1]
+        self.has_holiday_hours = np.zeros(self.size, dtype=bool)
+        self.has_holiday_hours[self.holiday_owner] = True
+
+        codes, uniques = pd.factorize(facilities_df['휴무일'])
+        closed = [parse_closed(str(value)) for value in uniques] + [([0] * 7, False)]
+        self.closed_weeks = np.array([c[0] for c in closed], dtype=np.uint8)[codes]
+        self.closed_on_holiday = np.array([c[1] for c in closed], dtype=bool)[codes]
+
+    def open_at(self, when, holiday=False):
+        """when(datetime) 에 영업 중인 시설 (행 위치 순서의 bool 배열).
+
+        holiday 이면 법정공휴일로 보고, 공휴일 운영시간이 있는 시설은 그 시간을,
+        없는 시설은 요일 운영시간을 쓰되 공휴일 휴무인 시설은 제외한다.
+        """
+        minute = when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+
+        hit = (self.start <= minute) & (minute < self.end)
+        owner = self.owner[hit]
+        day = self.day[hit]
+        # 휴무 주차도 구간이 시작된 날짜로 센다 (자정을 넘어 이어진 구간은 전날)
+        weeks = np.where(day == when.weekday(), _week_bits(when), _week_bits(when - timedelta(days=1)))
+        not_closed = self.closed_weeks[owner, day] & weeks == 0
+        result = np.zeros(self.size, dtype=bool)
+        result[owner[not_closed]] = True
+        if not holiday:
+            return result
+
+        result &= ~self.closed_on_holiday & ~self.has_holiday_hours
+        minute_of_day = minute % MINUTES_PER_DAY
+        hit = (self.holiday_start <= minute_of_day) & (minute_of_day < self.holiday_end)
+        result[self.holiday_owner[hit]] = True
+        return result
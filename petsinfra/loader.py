@@ -0,0 +1,482 @@
+"""resource/ 데이터를 프로세스당 한 번만 읽어 모든 세션이 공유하도록 하는 로더.
+
+Streamlit은 위젯을 조작할 때마다 스크립트 전체를 다시 실행하므로, 파일 읽기와
+dissolve/merge 같은 전처리는 ``st.cache_resource`` 로 감싸 한 번만 수행한다.
+(profiling.cache_resource 를 통해 감싸므로 디버그 패널에 단계별 시간과 캐시 적중이 기록된다)
+
+캐시 키는 (파일 경로, 내용 해시)이고, 각 캐시 함수는 자신이 실제로 쓰는 입력의 키만 받는다.
+그래서 seoul_pop.csv 만 바뀌면 인구 관련 항목과 병합 결과만 다시 계산되고 dissolve,
+공간 조인, 시설 색인은 그대로 재사용된다. 입력의 키 묶음(Snapshot)은 ``refresh()`` 가
+내용이 바뀐 것을 확인했을 때 한 번에 교체되며, 재실행 첫머리에서 ``pin()`` 으로 고정하면
+그 재실행은 끝날 때까지 같은 버전의 데이터만 본다.
+
+반환되는 DataFrame은 세션 간에 공유되는 객체이므로 읽기 전용으로 다룬다.
+(변경이 필요하면 ``rename``/``drop``/``copy`` 처럼 새 객체를 만드는 연산을 사용)
+"""
+import hashlib
+import os
+import threading
+
+import geopandas as gpd
+import pandas as pd
+
+from petsinfra import accessibility, artifacts, build, density, facilities, geometry, hours, metrics, profiling, search, spatial
+from petsinfra.facility_index import FacilityIndex
+from petsinfra.hours import OpeningHours
+from petsinfra.metrics import DistrictMetrics
+from petsinfra.proximity import FacilityProximity
+from petsinfra.search import FacilitySearch
+from petsinfra.paths import FACILITY_PATH, PETS_PATH, POPULATION_PATH, SEOUL_GEO_PATH
+
+INPUTS = {
+    'geo': SEOUL_GEO_PATH,
+    'population': POPULATION_PATH,
+    'pets': PETS_PATH,
+    'facilities': FACILITY_PATH,
+}
+INPUT_PATHS = list(INPUTS.values())
+
+# 파일이 갱신되면 예전 키의 항목은 더 이상 쓰이지 않으므로 소수만 유지
+# (교체 직전 버전으로 재실행 중인 세션이 있을 수 있어 2개)
+_MAX_ENTRIES = 2
+
+# 앱이 입력 파일의 변경을 확인하는 주기 (초)
+WATCH_INTERVAL_S = float(os.environ.get('PETSINFRA_WATCH_INTERVAL', 10))
+
+_lock = threading.Lock()
+_local = threading.local()
+_digests = {}  # 경로 -> ((수정 시각, 크기), 내용 해시)
+_current = None
+
+
+def file_key(path):
+    """캐시 키로 쓰는 (경로, 내용 해시) 튜플.
+
+    해시는 (수정 시각, 크기)가 바뀌었을 때만 다시 계산하므로, 내용이 같은 파일을 덮어써도
+    키는 그대로다.
+    """
+    stat = os.stat(path)
+    stamp = stat.st_mtime_ns, stat.st_size
+    cached = _digests.get(str(path))
+    if cached is None or cached[0] != stamp:
+        cached = stamp, artifacts.file_digest(path)
+        _digests[str(path)] = cached
+    return str(path), cached[1]
+
+
+class Snapshot:
+    """입력별 캐시 키 묶음. 한 번 만들어지면 바뀌지 않는다.
+
+    changed 는 직전 스냅샷과 비교해 내용이 바뀐 입력 이름이다.
+    """
+
+    def __init__(self, keys, previous=None):
+        self.keys = keys
+        self.version = hashlib.sha1(repr(sorted(keys.items())).encode()).hexdigest()[:12]
+        self.changed = tuple(
+            name for name, key in keys.items()
+            if previous is None or previous.keys.get(name) != key
+        )
+
+    def key(self, name):
+        return self.keys[name]
+
+
+def refresh():
+    """입력 파일의 내용이 바뀌었으면 새 스냅샷으로 교체한다. 최신 스냅샷을 반환한다."""
+    global _current
+    with _lock:
+        keys = {name: file_key(path) for name, path in INPUTS.items()}
+        if _current is None or keys != _current.keys:
+            _current = Snapshot(keys, _current)
+        return _current
+
+
+def pin():
+    """이번 재실행이 쓸 스냅샷을 고정한다. 재실행 첫머리에서 호출한다."""
+    _local.snapshot = refresh()
+    return _local.snapshot
+
+
+def snapshot():
+    """현재 스레드가 고정한 스냅샷. 고정하지 않았으면 최신 스냅샷."""
+    pinned = getattr(_local, 'snapshot', None)
+    if pinned is not None:
+        return pinned
+    return _current if _current is not None else refresh()
+
+
+def data_version():
+    """앱이 읽는 resource/ 입력 파일 전체의 버전 (파일 내용으로 만든 짧은 해시)."""
+    return snapshot().version
+
+
+def _key(name):
+    return snapshot().key(name)
+
+
+# 1. 원본 파일 로드
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _read_geo(key):
+    return gpd.read_file(key[0])
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _read_csv(key):
+    return pd.read_csv(key[0], encoding='utf-8')
+
+
+def load_seoul_gdf():
+    """행정동 단위 서울 경계 GeoDataFrame."""
+    return _read_geo(_key('geo'))
+
+
+# 페이지와 색인이 요청하는 시설 컬럼 묶음 (None 은 전체). _facilities 캐시 크기를 정하는 데 쓴다
+_FACILITY_PROJECTIONS = (
+    None,
+    tuple(facilities.MAP_COLUMNS),
+    tuple(facilities.COORDINATE_COLUMNS),
+    ('위도', '경도', '카테고리3'),
+    ('위도', '경도', '카테고리2', '카테고리3'),
+    ('카테고리2', '카테고리3'),
+    tuple(search.SEARCH_COLUMNS + search.FILTER_COLUMNS),
+    tuple(hours.COLUMNS),
+    metrics.COLUMNS,
+)
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _facility_table(key):
+    # 전체 컬럼을 한 번만 읽고, 컬럼 묶음은 이 표의 배열을 공유하는 DataFrame 으로 만든다
+    path = artifacts.fresh_path(build.FACILITY_STORE, [key])
+    if path is not None:
+        return facilities.read_store(path)
+    return facilities.read_csv(key[0])
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES * len(_FACILITY_PROJECTIONS))
+def _facilities(key, columns):
+    table = _facility_table(key)
+    return table if columns is None else facilities.project(table, columns)
+
+
+def load_facilities(columns=None):
+    """반려동물 동반 시설 목록 (seoul_pets.csv).
+
+    반복되는 문자열 필드는 category, 좌표는 float32 이다. columns 를 주면 그 컬럼만
+    읽는다 (facilities.MAP_COLUMNS 등).
+    """
+    return _facilities(_key('facilities'), None if columns is None else tuple(columns))
+
+
+def load_infra_count():
+    """구별 인프라 개수. 시설 좌표를 자치구 경계에 공간 조인해 센다.
+
+    infra_count.csv 와 같은 형식(행정구역명, 인프라개수)에 병합용 'sggnm' 컬럼이 추가되어 있다.
+    """
+    return _infra_count(_key('facilities'), _key('geo'))
+
+
+def load_population():
+    """구별 인구수. '동별' 값의 공백이 제거되어 있다."""
+    return _population(_key('population'))
+
+
+def load_pets():
+    """구별 반려동물 등록수. 병합용 'sggnm' 컬럼이 추가되어 있다."""
+    return _pets(_key('pets'))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _population(key):
+    population_df = _read_csv(key).copy()
+    population_df['동별'] = population_df['동별'].str.strip()  # 공백 제거 (필요한 경우)
+    return population_df
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _pets(key):
+    pets_df = _read_csv(key).copy()
+    pets_df['sggnm'] = pets_df['시군구'].str.strip()  # 공백 제거 (필요한 경우)
+    return pets_df
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _facility_index(facility_key):
+    return FacilityIndex(_facilities(facility_key, tuple(facilities.MAP_COLUMNS)))
+
+
+def load_facility_index():
+    """자치구별 시설 마커 trace 색인 (facility_index.FacilityIndex)."""
+    return _facility_index(_key('facilities'))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _proximity(facility_key):
+    return FacilityProximity(_facilities(facility_key, tuple(facilities.MAP_COLUMNS)))
+
+
+def load_proximity():
+    """반경/최근접 시설 검색 색인 (proximity.FacilityProximity)."""
+    return _proximity(_key('facilities'))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _facility_search(facility_key):
+    return FacilitySearch(_facilities(facility_key, tuple(search.SEARCH_COLUMNS + search.FILTER_COLUMNS)))
+
+
+def load_facility_search():
+    """시설명/주소/법정동 검색과 카테고리/자치구 필터 색인 (search.FacilitySearch)."""
+    return _facility_search(_key('facilities'))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _opening_hours(facility_key):
+    return OpeningHours(_facilities(facility_key, tuple(hours.COLUMNS)))
+
+
+def load_opening_hours():
+    """운영시간/휴무일을 해석한 주간 영업 구간 색인 (hours.OpeningHours)."""
+    return _opening_hours(_key('facilities'))
+
+
+@profiling.cache_resource(max_entries=64)
+def _density(facility_key, size_m, categories2, categories3):
+    columns = ('위도', '경도', '카테고리2', '카테고리3')
+    return density.facility_density(_facilities(facility_key, columns), size_m, categories2, categories3)
+
+
+def load_density(size_m, categories2=(), categories3=()):
+    """카테고리로 거른 시설의 육각형 칸별 개수. (칸 크기, 카테고리 조합)마다 한 번만 계산한다."""
+    return _density(_key('facilities'), size_m, tuple(sorted(categories2)), tuple(sorted(categories3)))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES * 4)
+def _dong_nearest_distance(facility_key, geo_key, category):
+    seoul_gdf = _read_geo(geo_key)
+    center = seoul_gdf.geometry.centroid
+    return pd.DataFrame({
+        'sggnm': seoul_gdf['sggnm'],
+        'adm_cd': seoul_gdf['adm_cd'],
+        'adm_nm': seoul_gdf['adm_nm'],
+        '거리(m)': _proximity(facility_key).nearest_distance(center.y, center.x, category),
+    })
+
+
+def load_dong_nearest_distance(category='동물병원'):
+    """행정동 중심에서 가장 가까운 category(카테고리3) 시설까지의 거리(m)."""
+    return _dong_nearest_distance(_key('facilities'), _key('geo'), category)
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _facility_areas(facility_key, geo_key):
+    path = artifacts.fresh_path(build.FACILITY_AREAS, [facility_key, geo_key])
+    if path is not None:
+        return pd.read_parquet(path)
+    return spatial.assign_facilities(_read_geo(geo_key), _facilities(facility_key, tuple(facilities.COORDINATE_COLUMNS)))
+
+
+def load_facility_areas():
+    """시설마다 좌표로 찾은 자치구/행정동 (columns: sggnm, adm_cd, adm_nm, 행 순서는 시설 목록과 동일)."""
+    return _facility_areas(_key('facilities'), _key('geo'))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _infra_count(facility_key, geo_key):
+    infra_count = spatial.district_counts(_facility_areas(facility_key, geo_key))
+    infra_count['sggnm'] = infra_count['행정구역명'].str.strip()  # 공백 제거 (필요한 경우)
+    return infra_count
+
+
+# 행정동 단위 (구를 선택했을 때의 drill-down)
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _dong_lod(geo_key):
+    path = artifacts.fresh_path(build.DONG_LOD_PARQUET, [geo_key])
+    if path is not None:
+        return gpd.read_parquet(path).set_index('adm_cd')
+    return geometry.dong_lod(_read_geo(geo_key).set_index('adm_cd'))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _dong_aggregates(facility_key, geo_key, pets_key):
+    dongs = spatial.dong_counts(_dong_lod(geo_key), _facility_areas(facility_key, geo_key))
+    # 반려동물 등록수는 구 단위로만 있으므로 동이 속한 구의 등록수를 기준으로 한다
+    pets = _pets(pets_key).set_index('sggnm')['등록수']
+    dongs['반려동물천마리당시설수'] = dongs['시설수'] * 1000 / dongs['sggnm'].map(pets)
+    return dongs
+
+
+def load_dong_aggregates():
+    """행정동별 시설 수와 반려동물 천 마리당 시설 수 (index: adm_cd, 서울 전체 425개 동)."""
+    return _dong_aggregates(_key('facilities'), _key('geo'), _key('pets'))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _accessibility_grid(geo_key, pets_key):
+    return accessibility.AccessibilityGrid(_read_geo(geo_key), _pets(pets_key).set_index('sggnm')['등록수'])
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES * 4)
+def _accessibility(facility_key, geo_key, pets_key, bandwidth_m):
+    return _accessibility_grid(geo_key, pets_key).scores(_facilities(facility_key, ('위도', '경도', '카테고리3')),
+                                                         bandwidth_m)
+
+
+def load_accessibility(bandwidth_m=1000):
+    """격자 기반 카테고리별 접근성 (accessibility.Accessibility). bandwidth_m 은 거리 감쇠 폭."""
+    return _accessibility(_key('facilities'), _key('geo'), _key('pets'), bandwidth_m)
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES * 25)
+def _dong_geojson(geo_key, gu):
+    dong_lod = _dong_lod(geo_key)
+    return geometry.load_geojson(geometry.to_geojson(dong_lod.loc[dong_lod['sggnm'] == gu, ['geometry']]))
+
+
+def load_dong_geojson(gu):
+    """gu 에 속한 행정동의 단순화 경계 GeoJSON(dict, feature id: adm_cd)."""
+    return _dong_geojson(_key('geo'), gu)
+
+
+# 2. 구별로 병합 (python -m petsinfra.build 로 미리 만든 산출물이 있으면 그것을 사용)
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _dissolved(geo_key):
+    path = artifacts.fresh_path(build.GU_PARQUET, [geo_key])
+    if path is not None:
+        return gpd.read_parquet(path).set_index('sggnm')
+    return geometry.dissolve_gu(_read_geo(geo_key))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _seoul_gu_gdf(geo_key):
+    return _dissolved(geo_key).drop(columns=['center_lat', 'center_lon'])
+
+
+def load_seoul_gu_gdf():
+    """자치구 단위로 dissolve 된 GeoDataFrame (index: sggnm)."""
+    return _seoul_gu_gdf(_key('geo'))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _gu_lod(geo_key):
+    path = artifacts.fresh_path(build.GU_LOD_PARQUET, [geo_key])
+    if path is not None:
+        lod_gdf = gpd.read_parquet(path)
+        return {
+            zoom: tier.set_index('sggnm').geometry
+            for zoom, tier in lod_gdf.groupby('zoom')
+        }
+    return geometry.build_lod(_seoul_gu_gdf(geo_key))
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES * len(geometry.LOD_ZOOMS))
+def _seoul_gu_geojson(geo_key, lod):
+    if lod is None:
+        path = artifacts.fresh_path(build.GU_GEOJSON, [geo_key])
+        gdf = _seoul_gu_gdf(geo_key)
+    else:
+        path = artifacts.fresh_path(build.gu_lod_geojson(lod), [geo_key])
+        gdf = gpd.GeoDataFrame(geometry=_gu_lod(geo_key)[lod])
+    if path is not None:
+        return geometry.load_geojson(path.read_text(encoding='utf-8'))
+    return geometry.load_geojson(geometry.to_geojson(gdf))
+
+
+def load_seoul_gu_geojson(zoom=None):
+    """자치구 경계 GeoJSON(dict). choropleth_mapbox 에 그대로 넘긴다.
+
+    zoom 을 주면 그 줌에 충분한 정밀도로 단순화된 경계를 반환한다.
+    """
+    lod = None if zoom is None else geometry.lod_zoom(zoom)
+    return _seoul_gu_geojson(_key('geo'), lod)
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _gu_centers(geo_key):
+    return _dissolved(geo_key)[['center_lat', 'center_lon']]
+
+
+def load_gu_centers():
+    """각 구의 중심 좌표 (index: sggnm, columns: center_lat, center_lon)."""
+    return _gu_centers(_key('geo'))
+
+
+# 3. 전처리: 인구/반려동물/인프라 데이터를 구 경계에 병합
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _merged(geo_key, population_key, pets_key, facility_key):
+    seoul_gu_gdf = _seoul_gu_gdf(geo_key)
+    population_df = _population(population_key)
+    pets_df = _pets(pets_key)
+    infra_count = _infra_count(facility_key, geo_key)
+
+    # '동별'과 'sggnm'의 값을 맞추어 병합
+    seoul_gdf_merged = seoul_gu_gdf.join(population_df.set_index('동별'), on='sggnm')
+    seoul_gdf_merged = pd.merge(seoul_gdf_merged, pets_df, on='sggnm', how='left')
+    seoul_gdf_merged = pd.merge(seoul_gdf_merged, infra_count, on='sggnm', how='left')
+
+    seoul_gdf_merged['정규화인구'] = seoul_gdf_merged['인구수'] / seoul_gdf_merged['인구수'].max()
+    seoul_gdf_merged['정규화반려동물'] = seoul_gdf_merged['등록수'] / seoul_gdf_merged['등록수'].max()
+
+    seoul_gdf_merged['인프라당반려동물'] = seoul_gdf_merged['등록수'] / seoul_gdf_merged['인프라개수']
+    return seoul_gdf_merged
+
+
+@profiling.cache_resource(max_entries=_MAX_ENTRIES * len(geometry.LOD_ZOOMS))
+def _merged_lod(geo_key, population_key, pets_key, facility_key, lod):
+    seoul_gdf_merged = _merged(geo_key, population_key, pets_key, facility_key)
+    tier = _gu_lod(geo_key)[lod]
+    return seoul_gdf_merged.set_geometry(
+        gpd.GeoSeries(tier.reindex(seoul_gdf_merged['sggnm']).values,
+                      index=seoul_gdf_merged.index, crs=tier.crs)
+    )
+
+
+def load_merged(zoom=None):
+    """구 경계 + 인구수 + 등록수 + 인프라개수 및 파생 지표.
+
+    지도에 그릴 때는 zoom 을 주어 그 줌에 맞게 단순화된 경계를 받는다.
+    """
+    keys = (
+        _key('geo'),
+        _key('population'),
+        _key('pets'),
+        _key('facilities'),
+    )
+    lod = None if zoom is None else geometry.lod_zoom(zoom)
+    if lod is None:
+        return _merged(*keys)
+    return _merged_lod(*keys, lod)
+
+
+# 4. 자치구 × 카테고리 시설 수 행렬
+@profiling.cache_resource(max_entries=_MAX_ENTRIES)
+def _district_metrics(geo_key, population_key, pets_key, facility_key):
+    return DistrictMetrics(
+        _seoul_gu_gdf(geo_key).index,
+        _facilities(facility_key, metrics.COLUMNS),
+        _facility_areas(facility_key, geo_key)['sggnm'],
+        _population(population_key).set_index('동별')['인구수'],
+        _pets(pets_key).set_index('sggnm')['등록수'],
+    )
+
+
+def load_district_metrics():
+    """자치구 × 카테고리 시설 수 행렬과 구별 인구/등록수 (metrics.DistrictMetrics)."""
+    return _district_metrics(_key('geo'), _key('population'), _key('pets'), _key('facilities'))
+
+
+_CACHED = (
+    _read_geo, _read_csv, _population, _pets,
+    _facility_table, _facilities, _facility_index, _proximity, _facility_search, _opening_hours,
+    _facility_areas, _infra_count, _dong_nearest_distance,
+    _density, _dong_lod, _dong_aggregates, _dong_geojson, _accessibility_grid, _accessibility,
+    _dissolved, _seoul_gu_gdf, _gu_lod, _seoul_gu_geojson, _gu_centers, _merged, _merged_lod,
+    _district_metrics,
+)
+
+
+def invalidate():
+    """캐시된 모든 데이터를 비운다. 다음 호출 시 resource/ 에서 다시 읽는다."""
+    for cached in _CACHED:
+        cached.clear()
@@ -0,0 +1,124 @@
+"""자치구 × 카테고리 시설 수 행렬과 구별 인구/등록수 벡터.
+
+EDA 그래프가 쓰는 집계(구별·카테고리별 시설 수, 인구/반려동물 대비 지표, 상·하위 구)는
+모두 이 행렬의 행/열 슬라이스로 구한다.
+
+카테고리별 시설 수는 주소의 자치구('시군구 명칭')로 센다 (원본 데이터의 구별 분류와 같은 수).
+구별 전체 시설 수(total, 인프라개수)는 좌표로 찾은 자치구(spatial.assign_facilities)로 세므로
+load_infra_count 와 같고, 두 기준이 다른 시설은 빌드의 infra_count_report.csv 에 남는다.
+"""
+import numpy as np
+import pandas as pd
+
+LEVELS = ('카테고리1', '카테고리2', '카테고리3')
+# 카테고리별 시설 수를 나누는 자치구 컬럼
+DISTRICT_COLUMN = '시군구 명칭'
+# DistrictMetrics 가 읽는 시설 컬럼
+COLUMNS = (DISTRICT_COLUMN, *LEVELS)
+
+
+class DistrictMetrics:
+    """행은 districts, 열은 카테고리 단계(LEVELS)별 categories 순서인 시설 수 행렬.
+
+    facilities_df 는 COLUMNS 컬럼(category dtype)을 가진 시설 DataFrame, located_districts 는
+    시설별로 좌표로 찾은 자치구 이름(경계 밖이면 NaN), population/pets 는 자치구 이름을 index 로
+    하는 Series 이다. population, pets 속성은 districts 순서의 float 벡터(값이 없으면 NaN)이다.
+    """
+
+    def __init__(self, districts, facilities_df, located_districts, population, pets):
+        self.districts = np.asarray(districts, dtype=object)
+        self._row = {name: i for i, name in enumerate(self.districts)}
+        n = len(self.districts)
+
+        rows = _district_codes(facilities_df[DISTRICT_COLUMN], self.districts)
+        self.counts = {}
+        self.categories = {}
+        self._column = {}
+        for level in LEVELS:
+            column = facilities_df[level]
+            codes = column.cat.codes.to_numpy().astype(np.int64)
+            width = len(column.cat.categories)
+            valid = (rows >= 0) & (codes >= 0)
+            flat = np.bincount(rows[valid] * width + codes[valid], minlength=n * width)
+            self.counts[level] = flat.reshape(n, width)
+            self.categories[level] = np.asarray(column.cat.categories, dtype=object)
+            self._column[level] = {category: j for j, category in enumerate(self.categories[level])}
+        located = _district_codes(located_districts, self.districts)
+        self.total = np.bincount(located[located >= 0], minlength=n)
+
+        self.population = pd.Series(population).reindex(self.districts).to_numpy(dtype=float)
+        self.pets = pd.Series(pets).reindex(self.districts).to_numpy(dtype=float)
+
+    def index(self, district):
+        return self._row[district]
+
+    def matrix(self, level):
+        """(자치구 수, 카테고리 수) 시설 수 행렬. 읽기 전용으로 사용한다."""
+        return self.counts[level]
+
+    def column(self, level, category):
+        """자치구별 category 시설 수."""
+        return self.counts[level][:, self._column[level][category]]
+
+    def row(self, district, level):
+        """district 의 카테고리별 시설 수 (categories[level] 순서)."""
+        return self.counts[level][self._row[district]]
+
+    def city(self, level):
+        """서울 전체 카테고리별 시설 수."""
+        return self.counts[level].sum(axis=0)
+
+    def _values(self, level, category):
+        if level is None:
+            return self.total
+        if category is None:
+            return self.counts[level]
+        return self.column(level, category)
+
+    def per_capita(self, level=None, category=None, per=10000):
+        """인구 per 명당 시설 수. level 만 주면 (자치구, 카테고리) 행렬을 반환한다."""
+        values = self._values(level, category)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return values * per / _as_column(self.population, values)
+
+    def per_pet(self, level=None, category=None, per=1000):
+        """반려동물 등록 per 마리당 시설 수."""
+        values = self._values(level, category)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return values * per / _as_column(self.pets, values)
+
+    def pets_per_facility(self):
+        """시설 하나당 반려동물 등록 수 (인프라당반려동물). 클수록 인프라가 부족하다."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.pets / self.total
+
+    def share(self, level, axis=1):
+        """카테고리 구성비. axis=1 은 자치구 안에서의 비율, axis=0 은 카테고리 안에서 각 자치구의 비율."""
+        counts = self.counts[level]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return counts / counts.sum(axis=axis, keepdims=True)
+
+    def top_k(self, values, k, largest=True):
+        """values(자치구 순서 벡터)가 가장 큰(작은) k 개 자치구 이름. NaN 은 제외하고, 같은 값은 앞 순서를 먼저."""
+        values = np.asarray(values, dtype=float)
+        candidates = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(-values[candidates] if largest else values[candidates], kind='stable')
+        return self.districts[candidates[order[:k]]].tolist()
+
+    def frame(self, level, district_column='sggnm', value_column='count'):
+        """(자치구, 카테고리, 시설 수) 긴 형식 DataFrame. 시설이 없는 조합은 제외한다."""
+        counts = self.counts[level]
+        rows, columns = np.nonzero(counts)
+        return pd.DataFrame({
+            district_column: self.districts[rows],
+            level: self.categories[level][columns],
+            value_column: counts[rows, columns],
+        })
+
+
+def _district_codes(names, districts):
+    return pd.Categorical(np.asarray(names, dtype=object), categories=districts).codes.astype(np.int64)
+
+
+def _as_column(vector, values):
+    return vector[:, None] if np.ndim(values) == 2 else vector
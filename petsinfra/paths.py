@@ -0,0 +1,17 @@
+"""resource/ 입력 파일과 빌드 산출물 경로.
+
+환경 변수 PETSINFRA_RESOURCE_DIR 로 다른 디렉터리(예: 벤치마크용 합성 데이터)를 쓸 수 있다.
+"""
+import os
+from pathlib import Path
+
+RESOURCE_DIR = Path(os.environ.get(
+    'PETSINFRA_RESOURCE_DIR', Path(__file__).resolve().parent.parent / 'resource'
+)).resolve()
+BUILD_DIR = RESOURCE_DIR / 'build'
+
+SEOUL_GEO_PATH = RESOURCE_DIR / 'seoul_gu.geojson'
+POPULATION_PATH = RESOURCE_DIR / 'seoul_pop.csv'
+PETS_PATH = RESOURCE_DIR / 'pets_count.csv'
+INFRA_COUNT_PATH = RESOURCE_DIR / 'infra_count.csv'
+FACILITY_PATH = RESOURCE_DIR / 'seoul_pets.csv'
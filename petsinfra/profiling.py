@@ -0,0 +1,215 @@
+"""재실행(rerun) 단위의 구간 시간/카운터 기록.
+
+스크립트 첫머리에서 ``start(enabled)`` 를 호출하면 그 재실행 동안 같은 스레드에서
+열린 ``span`` 과 ``count`` 가 Recorder 에 쌓인다. Streamlit 은 세션마다 별도 스레드에서
+스크립트를 실행하므로 기록은 스레드 로컬로 보관한다.
+
+기록이 꺼져 있으면 ``span`` 은 미리 만들어 둔 nullcontext 를, ``count`` 는 바로 반환하므로
+추가 비용은 스레드 로컬 조회 한 번이다.
+
+환경 변수 PETSINFRA_PROFILE_LOG 에 파일 경로를 지정하면 모든 재실행을 기록하고
+재실행마다 JSON 한 줄씩 그 파일에 덧붙인다.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+import streamlit as st
+from streamlit import dataframe_util
+
+PROFILE_LOG = os.environ.get('PETSINFRA_PROFILE_LOG')
+# 디버그 패널에서 내려받을 수 있도록 세션마다 보관하는 최근 재실행 기록 수
+MAX_HISTORY = 50
+
+_local = threading.local()
+_NULL = nullcontext()
+
+
+class Recorder:
+    """한 번의 재실행 동안의 구간(span)과 카운터."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.page = None
+        self.spans = []  # dict(name, depth, start_ms, ms[, cache])
+        self.counters = {}
+        self._t0 = time.perf_counter()
+        self._depth = 0
+        self._total_ms = None
+
+    @contextmanager
+    def span(self, name, **attrs):
+        record = dict(name=name, depth=self._depth, start_ms=self._elapsed_ms(), ms=None, **attrs)
+        self.spans.append(record)
+        self._depth += 1
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record['ms'] = round(self._elapsed_ms() - record['start_ms'], 3)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self):
+        self._total_ms = round(self._elapsed_ms(), 3)
+        return self
+
+    def to_dict(self):
+        return {
+            'started': self.started,
+            'page': self.page,
+            'total_ms': self._total_ms if self._total_ms is not None else round(self._elapsed_ms(), 3),
+            'spans': self.spans,
+            'counters': self.counters,
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def _elapsed_ms(self):
+        return round((time.perf_counter() - self._t0) * 1000, 3)
+
+
+def start(enabled=False):
+    """이번 재실행의 기록을 시작한다. 기록하지 않으면 None 을 반환한다."""
+    recorder = Recorder() if enabled or PROFILE_LOG else None
+    _local.recorder = recorder
+    return recorder
+
+
+def finish():
+    """이번 재실행의 기록을 마치고 Recorder 를 반환한다 (PROFILE_LOG 가 있으면 한 줄 덧붙임)."""
+    recorder = current()
+    _local.recorder = None
+    if recorder is None:
+        return None
+    recorder.finish()
+    if PROFILE_LOG:
+        with open(PROFILE_LOG, 'a', encoding='utf-8') as f:
+            f.write(recorder.to_json() + '\n')
+    return recorder
+
+
+def current():
+    return getattr(_local, 'recorder', None)
+
+
+def span(name, **attrs):
+    """이름 붙은 구간. 기록 중이 아니면 아무 일도 하지 않는다."""
+    recorder = current()
+    if recorder is None:
+        return _NULL
+    return recorder.span(name, **attrs)
+
+
+def count(name, n=1):
+    recorder = current()
+    if recorder is not None:
+        recorder.count(name, n)
+
+
+def payload_size(obj):
+    """브라우저로 보내는 직렬화 결과의 대략적인 바이트 수 (plotly Figure, pydeck Deck, DataFrame)."""
+    if isinstance(obj, pd.DataFrame):
+        return len(dataframe_util.convert_pandas_df_to_arrow_bytes(obj))
+    if hasattr(obj, 'to_plotly_json'):
+        import plotly.io as pio  # plotly 를 쓰지 않는 페이지는 import 하지 않음
+        return len(pio.to_json(obj, validate=False).encode())
+    if hasattr(obj, 'to_json'):
+        return len(obj.to_json().encode())
+    return None
+
+
+@contextmanager
+def chart(name, obj):
+    """st.plotly_chart/st.pydeck_chart/st.dataframe 호출 구간. 기록 중이면 전송 크기도 센다."""
+    recorder = current()
+    if recorder is None:
+        yield
+        return
+    with recorder.span(f'render.{name}'):
+        yield
+    nbytes = payload_size(obj)
+    if nbytes is not None:
+        recorder.count(f'payload_bytes.{name}', nbytes)
+        recorder.count('payload_bytes', nbytes)
+
+
+def _default_name(func):
+    return f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__.lstrip('_')}"
+
+
+def timed(func=None, *, name=None):
+    """함수 호출을 구간으로 기록하는 데코레이터 (@timed 또는 @timed(name=...))."""
+    if func is None:
+        return functools.partial(timed, name=name)
+    name = name or _default_name(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = current()
+        if recorder is None:
+            return func(*args, **kwargs)
+        with recorder.span(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def cache_resource(func=None, *, name=None, **cache_kwargs):
+    """st.cache_resource 와 같지만 호출마다 구간과 캐시 적중/실패 횟수를 기록한다.
+
+    구간에는 cache='hit'|'miss' 가 붙고, 실패한 호출 안에서 다시 부른 캐시 함수는
+    하위 구간으로 기록된다. Streamlit 의 캐시 키는 원래 함수의 이름과 소스로 만들어진다.
+    """
+    if func is None:
+        return functools.partial(cache_resource, name=name, **cache_kwargs)
+    name = name or _default_name(func)
+    misses = f'cache_miss.{name}'
+
+    @functools.wraps(func)
+    def compute(*args, **kwargs):
+        count(misses)
+        return func(*args, **kwargs)
+
+    cached = st.cache_resource(show_spinner=False, **cache_kwargs)(compute)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = current()
+        if recorder is None:
+            return cached(*args, **kwargs)
+        before = recorder.counters.get(misses, 0)
+        with recorder.span(name) as record:
+            result = cached(*args, **kwargs)
+            hit = recorder.counters.get(misses, 0) == before
+            record['cache'] = 'hit' if hit else 'miss'
+        if hit:
+            recorder.count(f'cache_hit.{name}')
+        return result
+
+    wrapper.clear = cached.clear
+    return wrapper
+
+
+def render_panel(recorder):
+    """사이드바 디버그 패널. 이번 재실행의 구간/카운터와 최근 재실행 기록(JSON-lines)을 보여준다."""
+    history = st.session_state.setdefault('_profiling_history', [])
+    history.append(recorder.to_json())
+    del history[:-MAX_HISTORY]
+
+    st.caption(f"재실행 {recorder.to_dict()['total_ms']:.1f} ms · 페이지 {recorder.page}")
+    if recorder.spans:
+        spans = pd.DataFrame(recorder.spans)
+        spans['name'] = ['· ' * depth + name for depth, name in zip(spans['depth'], spans['name'])]
+        st.dataframe(spans.drop(columns='depth'), hide_index=True)
+    if recorder.counters:
+        counters = pd.Series(recorder.counters, name='값').rename_axis('카운터').reset_index()
+        st.dataframe(counters, hide_index=True)
+    st.download_button('재실행 기록 (JSON-lines)', '\n'.join(history) + '\n',
+                       file_name='petsinfra_profile.jsonl', mime='application/jsonl')
@@ -0,0 +1,171 @@
+"""위경도 격자 색인 기반의 반경/최근접 시설 검색.
+
+시설 좌표를 한 번 격자 칸 번호로 정렬해 두고, 질의 시에는 반경을 덮는 칸들의
+구간만 searchsorted 로 찾아 후보를 모은 뒤 haversine 거리로 거른다.
+"""
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """두 좌표(도) 사이의 대원 거리(m). 배열끼리 브로드캐스트된다."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GridIndex:
+    """점 집합에 대한 격자 색인. 칸의 크기는 대략 cell_m 미터이다."""
+
+    def __init__(self, lat, lon, cell_m=250.0):
+        self.lat = np.asarray(lat, dtype='float64')
+        self.lon = np.asarray(lon, dtype='float64')
+        lat0 = np.radians(self.lat.mean()) if len(self.lat) else 0.0
+        self.cell_lat = np.degrees(cell_m / EARTH_RADIUS_M)
+        self.cell_lon = self.cell_lat / max(np.cos(lat0), 1e-6)
+        self.cell_m = cell_m
+
+        cy = np.floor(self.lat / self.cell_lat).astype('int64')
+        cx = np.floor(self.lon / self.cell_lon).astype('int64')
+        self.cy_min, self.cx_min = (cy.min(), cx.min()) if len(cy) else (0, 0)
+        self.ny = (cy.max() - self.cy_min + 1) if len(cy) else 1
+        self.nx = (cx.max() - self.cx_min + 1) if len(cx) else 1
+        keys = (cx - self.cx_min) * self.ny + (cy - self.cy_min)
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _candidates_many(self, lat, lon, radius_m):
+        """질의 좌표 배열 각각의 반경을 덮는 칸에 든 점들. (질의 위치, 점 위치) 쌍 배열을 반환한다."""
+        # 반경을 덮는 경계 상자 (질의 위도 기준의 경도 폭)
+        dlat = np.degrees(radius_m / EARTH_RADIUS_M)
+        dlon = dlat / np.maximum(np.cos(np.radians(lat)), 1e-6)
+        y0 = np.maximum(np.floor((lat - dlat) / self.cell_lat).astype('int64') - self.cy_min, 0)
+        y1 = np.minimum(np.floor((lat + dlat) / self.cell_lat).astype('int64') - self.cy_min, self.ny - 1)
+        x0 = np.maximum(np.floor((lon - dlon) / self.cell_lon).astype('int64') - self.cx_min, 0)
+        x1 = np.minimum(np.floor((lon + dlon) / self.cell_lon).astype('int64') - self.cx_min, self.nx - 1)
+        width = np.where(y0 <= y1, np.maximum(x1 - x0 + 1, 0), 0)
+
+        # 한 열(x)의 칸들은 키가 연속이므로 (질의, 열)마다 구간 하나로 찾는다
+        query = np.repeat(np.arange(len(lat)), width)
+        xs = np.arange(width.sum()) - np.repeat(np.cumsum(width) - width, width) + x0[query]
+        lo = np.searchsorted(self.keys, xs * self.ny + y0[query], side='left')
+        hi = np.searchsorted(self.keys, xs * self.ny + y1[query], side='right')
+        lengths = hi - lo
+        total = lengths.sum()
+        offsets = np.repeat(lo - np.cumsum(lengths) + lengths, lengths)
+        return np.repeat(query, lengths), self.order[np.arange(total) + offsets]
+
+    def _candidates(self, lat, lon, radius_m):
+        _, idx = self._candidates_many(np.array([lat], dtype='float64'), np.array([lon], dtype='float64'), radius_m)
+        return idx
+
+    def radius(self, lat, lon, radius_m, mask=None):
+        """반경 안의 점 위치와 거리(m), 가까운 순. mask(점 순서의 bool 배열)를 주면 True 인 점만."""
+        idx = self._candidates(lat, lon, radius_m)
+        if mask is not None:
+            idx = idx[mask[idx]]
+        dist = haversine(lat, lon, self.lat[idx], self.lon[idx])
+        keep = dist <= radius_m
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind='stable')
+        return idx[order], dist[order]
+
+    def nearest(self, lat, lon, k=1, mask=None):
+        """가장 가까운 k개 점의 위치와 거리(m), 가까운 순. mask 는 radius 와 같다."""
+        k = min(k, len(self) if mask is None else int(mask.sum()))
+        if k == 0:
+            return np.empty(0, dtype='int64'), np.empty(0)
+        radius_m = self.cell_m
+        while True:
+            idx, dist = self.radius(lat, lon, radius_m, mask)
+            # 반경 안에서 k개를 찾았다면 반경 밖의 점은 더 가까울 수 없다
+            if len(idx) >= k:
+                return idx[:k], dist[:k]
+            if radius_m > 2 * np.pi * EARTH_RADIUS_M:
+                return idx, dist
+            radius_m *= 2
+
+    def nearest_distance(self, lat, lon):
+        """여러 질의 좌표 각각에서 가장 가까운 점까지의 거리(m). 점이 없으면 NaN.
+
+        nearest 와 같이 반경을 두 배씩 넓히되, 아직 점을 찾지 못한 질의들을 한 번에 처리한다.
+        """
+        lat = np.asarray(lat, dtype='float64')
+        lon = np.asarray(lon, dtype='float64')
+        result = np.full(len(lat), np.nan)
+        if len(self) == 0:
+            return result
+        pending = np.arange(len(lat))
+        radius_m = self.cell_m
+        while len(pending):
+            query, idx = self._candidates_many(lat[pending], lon[pending], radius_m)
+            dist = haversine(lat[pending][query], lon[pending][query], self.lat[idx], self.lon[idx])
+            best = np.full(len(pending), np.inf)
+            # 반경 안에서 찾은 점이 있으면 반경 밖의 점은 더 가까울 수 없다
+            within = dist <= radius_m
+            np.minimum.at(best, query[within], dist[within])
+            found = np.isfinite(best)
+            result[pending[found]] = best[found]
+            if radius_m > 2 * np.pi * EARTH_RADIUS_M:
+                break
+            pending = pending[~found]
+            radius_m *= 2
+        return result
+
+
+class FacilityProximity:
+    """전체 시설과 카테고리3 별 격자 색인."""
+
+    def __init__(self, facilities_df, cell_m=250.0):
+        self.facilities_df = facilities_df
+        self.index = GridIndex(facilities_df['위도'], facilities_df['경도'], cell_m)
+        category = facilities_df['카테고리3'].astype(str).to_numpy()
+        self.categories = sorted(set(category))
+        self.rows = {c: np.flatnonzero(category == c) for c in self.categories}
+        self.by_category = {
+            c: GridIndex(self.index.lat[rows], self.index.lon[rows], cell_m)
+            for c, rows in self.rows.items()
+        }
+
+    def _search(self, lat, lon, radius_m, k, category, mask):
+        index = self.index if category is None else self.by_category.get(category)
+        if index is None:
+            return np.empty(0, dtype='int64'), np.empty(0)
+        if mask is not None and category is not None:
+            mask = mask[self.rows[category]]
+        if radius_m is not None:
+            idx, dist = index.radius(lat, lon, radius_m, mask)
+            if k is not None:
+                idx, dist = idx[:k], dist[:k]
+        else:
+            idx, dist = index.nearest(lat, lon, k or 1, mask)
+        return (idx if category is None else self.rows[category][idx]), dist
+
+    def query(self, lat, lon, radius_m=None, k=None, categories=None, mask=None):
+        """(lat, lon) 주변 시설. radius_m 안의 시설, 또는 가장 가까운 k개(둘 다 주면 반경 안 k개).
+
+        categories 를 주면 그 카테고리3 만 찾는다. mask(facilities_df 행 위치 순서의 bool 배열,
+        예: hours.OpeningHours.open_at)를 주면 True 인 시설만 찾는다. 결과는 '거리(m)' 컬럼이 붙은
+        시설 행이며 가까운 순으로 정렬된다.
+        """
+        if not categories:
+            rows, dist = self._search(lat, lon, radius_m, k, None, mask)
+        else:
+            found = [self._search(lat, lon, radius_m, k, c, mask) for c in categories]
+            rows = np.concatenate([r for r, _ in found])
+            dist = np.concatenate([d for _, d in found])
+            order = np.argsort(dist, kind='stable')[:k]
+            rows, dist = rows[order], dist[order]
+        return self.facilities_df.iloc[rows].assign(**{'거리(m)': dist.round(1)})
+
+    def nearest_distance(self, lat, lon, category):
+        """여러 좌표에서 가장 가까운 category 시설까지의 거리(m)를 한 번에 구한다."""
+        index = self.by_category.get(category)
+        if index is None:
+            return np.full(len(np.asarray(lat)), np.nan)
+        return index.nearest_distance(lat, lon)
@@ -0,0 +1,122 @@
+"""점이 많을 때 지도에 마커 대신 올리는 래스터(PNG) 집계.
+
+점 좌표를 웹 메르카토르 픽셀 격자로 옮겨 np.bincount 로 픽셀마다 개수와 카테고리 색의 합을 센다
+(datashader 방식). 픽셀 색은 카테고리 색을 개수로 가중 평균한 것, 투명도는 log(개수)에 비례한다.
+한 점이 한 픽셀이면 잘 보이지 않으므로 spread 픽셀만큼 이웃 칸까지 합쳐 번지게 한다.
+
+전송량은 점 수가 아니라 이미지 크기에 비례한다. 결과 Raster 는 Plotly mapbox 의 image 레이어
+(``mapbox_layer``)나 pydeck BitmapLayer(``image``, ``bounds``)에 그대로 올린다.
+``colorize`` 는 이미 칸별로 계산된 값(접근성 격자 등)을 같은 형식의 이미지로 칠한다.
+"""
+import base64
+import io
+
+import numpy as np
+from PIL import Image
+
+
+def _mercator_y(lat):
+    return np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+
+
+def _rgb(color):
+    return [int(color[i:i + 2], 16) for i in (1, 3, 5)]
+
+
+def _spread(values, radius):
+    """(높이, 너비, ...) 배열의 각 칸에 (2*radius+1)^2 이웃 칸의 합을 넣는다."""
+    if radius <= 0:
+        return values
+    height, width = values.shape[:2]
+    padding = [(radius, radius), (radius, radius)] + [(0, 0)] * (values.ndim - 2)
+    padded = np.pad(values, padding)
+    total = np.zeros_like(values)
+    for dy in range(2 * radius + 1):
+        for dx in range(2 * radius + 1):
+            total += padded[dy:dy + height, dx:dx + width]
+    return total
+
+
+class Raster:
+    """점 개수 래스터 이미지 (PNG data URI)와 지도 위 위치 (west, south, east, north)."""
+
+    def __init__(self, image, bounds, size, points):
+        self.image = image
+        self.bounds = bounds
+        self.size = size  # (너비, 높이) 픽셀
+        self.points = points
+
+    def mapbox_layer(self):
+        """Plotly layout.mapbox.layers 항목."""
+        west, south, east, north = self.bounds
+        return dict(
+            sourcetype='image',
+            source=self.image,
+            coordinates=[[west, north], [east, north], [east, south], [west, south]],
+        )
+
+
+def _png_uri(image):
+    buffer = io.BytesIO()
+    Image.fromarray(image, 'RGBA').save(buffer, format='PNG', compress_level=1)
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def colorize(values, bounds, colorscale, vmin, vmax, alpha=180):
+    """(높이, 너비) 격자 값(0 행이 남쪽)을 colorscale([[위치 0~1, '#rrggbb'], ...])로 칠한 Raster.
+
+    값은 [vmin, vmax] 로 자르고, NaN 인 칸은 투명하게 둔다. bounds 는 격자 바깥 경계
+    (west, south, east, north)이다. 위도 방향 칸 간격이 일정한 격자를 그대로 메르카토르 지도에
+    올리므로 서울 범위(위도 0.3도)에서 생기는 위치 오차는 칸 크기보다 훨씬 작다.
+    """
+    values = np.asarray(values, dtype='float64')[::-1]
+    filled = ~np.isnan(values)
+    position = (np.clip(values[filled], vmin, vmax) - vmin) / (vmax - vmin)
+    stops = [stop for stop, _ in colorscale]
+    channels = np.array([_rgb(color) for _, color in colorscale], dtype='float64')
+
+    image = np.zeros(values.shape + (4,), dtype=np.uint8)
+    for c in range(3):
+        image[filled, c] = np.interp(position, stops, channels[:, c]).round().astype(np.uint8)
+    image[filled, 3] = alpha
+    height, width = values.shape
+    return Raster(_png_uri(image), tuple(bounds), (width, height), int(filled.sum()))
+
+
+def rasterize(lon, lat, codes, colors, width=800, spread=1, min_alpha=90):
+    """점(lon, lat)을 width 픽셀 너비의 래스터로 집계한다.
+
+    codes 는 점마다 colors('#rrggbb' 목록)의 번호이다. 높이는 점 범위의 메르카토르 비율로 정한다.
+    """
+    lon = np.asarray(lon, dtype='float64')
+    lat = np.asarray(lat, dtype='float64')
+    west, east = lon.min(), lon.max()
+    south, north = lat.min(), lat.max()
+    # 점이 한 곳에 몰려 있어도 0 으로 나누지 않도록 최소 범위 (약 100 m)
+    pad_lon = max((east - west) * 0.02, 0.001)
+    pad_lat = max((north - south) * 0.02, 0.001)
+    west, east, south, north = west - pad_lon, east + pad_lon, south - pad_lat, north + pad_lat
+
+    x0, x1 = np.radians(west), np.radians(east)
+    y0, y1 = _mercator_y(south), _mercator_y(north)
+    height = max(1, int(round(width * (y1 - y0) / (x1 - x0))))
+
+    # 픽셀 번호 (0 행이 북쪽)
+    px = np.clip(((np.radians(lon) - x0) / (x1 - x0) * width).astype(np.int64), 0, width - 1)
+    py = np.clip(((y1 - _mercator_y(lat)) / (y1 - y0) * height).astype(np.int64), 0, height - 1)
+    pixel = py * width + px
+    size = width * height
+
+    palette = np.array([_rgb(color) for color in colors], dtype='float64')[codes]
+    counts = np.bincount(pixel, minlength=size).astype('float64').reshape(height, width)
+    sums = np.stack([np.bincount(pixel, weights=palette[:, c], minlength=size) for c in range(3)], axis=-1)
+    counts = _spread(counts, spread)
+    sums = _spread(sums.reshape(height, width, 3), spread)
+
+    filled = counts > 0
+    image = np.zeros((height, width, 4), dtype=np.uint8)
+    image[filled, :3] = (sums[filled] / counts[filled, None]).round().astype(np.uint8)
+    level = np.log1p(counts[filled]) / np.log1p(counts.max())
+    image[filled, 3] = (min_alpha + (255 - min_alpha) * level).round().astype(np.uint8)
+
+    return Raster(_png_uri(image), (west, south, east, north), (width, height), len(lon))
@@ -0,0 +1,132 @@
+"""시설 목록 검색 색인.
+
+시설명, 도로명주소, 법정읍면동명칭을 공백을 없앤 소문자 문자열로 바꿔 두고, 문자 1-gram 과
+2-gram 마다 그 문자열을 포함하는 행 번호 목록(posting)을 만든다. 색인은 NumPy 배열
+(정렬된 n-gram 키, 키별 시작/끝 위치, 행 번호)뿐이라 파이썬 dict 없이 searchsorted 로 찾는다.
+
+검색어는 공백으로 나눈 단어를 모두 포함하는 행을 찾는다 (부분 문자열, AND). 단어의 모든
+2-gram 을 포함하는 행으로 후보를 좁힌 뒤, 세 글자 이상이면 후보만 실제 문자열과 대조한다.
+카테고리/자치구 필터는 category 코드 비교로 처리한다.
+"""
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = ['시설명', '도로명주소', '법정읍면동명칭']
+FILTER_COLUMNS = ['카테고리2', '카테고리3', '시군구 명칭']
+
+_SEPARATOR = '\0'
+
+
+def normalize(text):
+    """검색용 정규화: 소문자, 공백 제거."""
+    return ''.join(text.lower().split())
+
+
+def _normalized_column(column):
+    """컬럼의 각 값을 정규화한 문자열 배열. 같은 값은 한 번만 정규화한다 (결측값은 '')."""
+    codes, uniques = pd.factorize(column)
+    normalized = np.array([normalize(str(value)) for value in uniques] + [''], dtype=object)
+    return normalized[codes]
+
+
+class FacilitySearch:
+    """facilities_df(SEARCH_COLUMNS + FILTER_COLUMNS 포함)의 검색/필터 색인. 결과는 행 위치(iloc)이다."""
+
+    def __init__(self, facilities_df):
+        self.size = len(facilities_df)
+        # 필드 사이에 구분 문자를 넣어 두 필드에 걸친 검색어는 일치하지 않게 한다
+        columns = [_normalized_column(facilities_df[column]) for column in SEARCH_COLUMNS]
+        self.texts = [_SEPARATOR.join(values) for values in zip(*columns)]
+
+        # 전체 문자열을 한 배열로 이어 붙이고, 문자마다 행 번호를 붙인다
+        joined = _SEPARATOR.join(self.texts) + _SEPARATOR
+        chars = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32)
+        lengths = np.fromiter((len(text) + 1 for text in self.texts), dtype=np.int64, count=self.size)
+        rows = np.repeat(np.arange(self.size, dtype=np.uint64), lengths)
+
+        # 등장한 문자에 1부터 번호를 매긴다 (0 은 구분 문자). n-gram 키는 번호 두 개를 합친 정수
+        present = np.zeros(0x110000, dtype=bool)
+        present[chars] = True
+        present[ord(_SEPARATOR)] = False
+        self._ids = np.cumsum(present, dtype=np.int64) * present
+        self._radix = np.uint64(present.sum() + 1)
+        ids = self._ids[chars].astype(np.uint64)
+
+        valid = ids > 0
+        pair = valid[:-1] & valid[1:]
+        keys = np.concatenate([ids[valid], ids[:-1][pair] * self._radix + ids[1:][pair]])
+        key_rows = np.concatenate([rows[valid], rows[:-1][pair]])
+
+        # (키, 행)을 정수 하나로 묶어 정렬·중복 제거한 뒤 키별 posting 으로 나눈다
+        self._row_bits = np.uint64(max(1, int(self.size).bit_length()))
+        packed = np.unique((keys << self._row_bits) | key_rows)
+        keys = packed >> self._row_bits
+        self._postings = (packed & ((np.uint64(1) << self._row_bits) - np.uint64(1))).astype(np.int64)
+        self._keys, self._starts = np.unique(keys, return_index=True)
+        self._ends = np.append(self._starts[1:], len(keys))
+
+        self.filters = {
+            column: (facilities_df[column].cat.categories, facilities_df[column].cat.codes.to_numpy())
+            for column in FILTER_COLUMNS
+        }
+
+    def _posting(self, key):
+        i = np.searchsorted(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            return np.empty(0, dtype=np.int64)
+        return self._postings[self._starts[i]:self._ends[i]]
+
+    def _match_term(self, term):
+        codepoints = np.frombuffer(term.encode('utf-32-le'), dtype=np.uint32)
+        ids = self._ids[np.minimum(codepoints, len(self._ids) - 1)].astype(np.uint64)
+        if (ids == 0).any():
+            return np.empty(0, dtype=np.int64)
+        if len(ids) == 1:
+            return self._posting(ids[0])
+        postings = sorted(
+            (self._posting(key) for key in np.unique(ids[:-1] * self._radix + ids[1:])),
+            key=len,
+        )
+        rows = postings[0]
+        for posting in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = rows[np.isin(rows, posting, assume_unique=True)]
+        if len(ids) > 2:
+            texts = self.texts
+            rows = rows[np.fromiter((term in texts[i] for i in rows), dtype=bool, count=len(rows))]
+        return rows
+
+    def query(self, text='', filters=None):
+        """검색어와 필터({FILTER_COLUMNS 중 컬럼: 허용 값 목록})를 모두 만족하는 행 위치 (오름차순).
+
+        예: query('강남 병원', {'카테고리3': ['동물병원'], '시군구 명칭': ['강남구']})
+        빈 목록인 필터는 적용하지 않는다.
+        """
+        mask = None
+        for name, values in (filters or {}).items():
+            if not values:
+                continue
+            categories, codes = self.filters[name]
+            allowed = categories.get_indexer(list(values))
+            column_mask = np.isin(codes, allowed[allowed >= 0])
+            mask = column_mask if mask is None else mask & column_mask
+
+        rows = None
+        for term in dict.fromkeys(normalize(word) for word in text.split()):
+            matched = self._match_term(term)
+            rows = matched if rows is None else rows[np.isin(rows, matched, assume_unique=True)]
+
+        if rows is None:
+            return np.arange(self.size) if mask is None else np.flatnonzero(mask)
+        return rows if mask is None else rows[mask[rows]]
+
+
+def page(df, rows, number, size):
+    """검색 결과 rows 중 number 번째(1부터) 페이지에 해당하는 df 의 행."""
+    start = (number - 1) * size
+    return df.iloc[rows[start:start + size]]
+
+
+def page_count(total, size):
+    return max(1, -(-total // size))
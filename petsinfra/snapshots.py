@@ -0,0 +1,159 @@
+"""EDA 페이지 그래프/지도의 정적 스냅샷 (resource/build/eda/).
+
+    python -m petsinfra.snapshots
+
+EDA 페이지의 plotly 그래프와 pydeck 지도를 브라우저로 보내는 JSON 그대로(``<이름>.<버전>.json``)와
+단독으로 열 수 있는 HTML(``<이름>.<버전>.html``, plotly.js/deck.gl 은 CDN)로 저장한다. 버전은 그
+그래프가 쓰는 입력 파일들의 내용 해시(figures.snapshot_builders 참고)와 코드 버전(code_version)으로
+만든다. 코드 버전은 figures 와 그 모듈이 직접·간접으로 import 하는 petsinfra 모듈(loader, spatial,
+facilities 등) 전체의 소스, plotly/pydeck 버전, SNAPSHOT_SCHEMA 의 해시이다. 그래서 인구 파일만
+바뀌면 인구 그래프의 스냅샷만 쓸 수 없게 되고, 그래프를 만드는 데 쓰이는 코드가 바뀌면 모든
+스냅샷을 쓰지 않는다. 버전이 맞지 않는 그래프는 앱이 직접 만든다.
+
+앱은 현재 버전의 스냅샷이 있으면 데이터로 그래프를 만들지 않고 파일에서 읽는다. pydeck 지도는
+읽은 JSON 을 그대로 보내고, plotly 그래프는 한 번 Figure 로 읽어 캐시해 두며 재실행마다
+st.plotly_chart 가 다시 직렬화한다. 즉 스냅샷이 줄이는 것은 첫 실행(데이터 적재와 그래프 생성)이다.
+"""
+import ast
+import hashlib
+import html
+import importlib.metadata
+import time
+from pathlib import Path
+
+from petsinfra import artifacts, loader
+from petsinfra.paths import BUILD_DIR
+
+SNAPSHOT_DIR = BUILD_DIR / 'eda'
+# 스냅샷 파일 형식을 바꾸면 올린다 (코드 변경은 code_version 이 알아서 반영한다)
+SNAPSHOT_SCHEMA = 1
+# 그래프 코드의 시작 모듈. 이 모듈에서 import 를 따라가 닿는 petsinfra 모듈의 소스가 모두 코드 버전에 들어간다
+CODE_ROOTS = ('figures',)
+# 직렬화 결과에 영향을 주는 라이브러리
+LIBRARIES = ('plotly', 'pydeck')
+
+PACKAGE = 'petsinfra'
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+_code_version = None
+
+
+def _module_path(name):
+    """petsinfra 안의 모듈 이름('loader', 'views.eda')의 소스 경로. 모듈이 아니면(함수/클래스 등) None."""
+    base = PACKAGE_DIR.joinpath(*name.split('.'))
+    for candidate in (base.with_suffix('.py'), base / '__init__.py'):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _imports(path):
+    """소스가 import 하는 petsinfra 모듈 이름 후보 (함수 안의 지연 import 포함)."""
+    names = set()
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            if node.module == PACKAGE:
+                names.update(alias.name for alias in node.names)
+            elif node.module.startswith(PACKAGE + '.'):
+                module = node.module[len(PACKAGE) + 1:]
+                names.add(module)
+                names.update(f'{module}.{alias.name}' for alias in node.names)
+        elif isinstance(node, ast.Import):
+            names.update(alias.name[len(PACKAGE) + 1:] for alias in node.names
+                         if alias.name.startswith(PACKAGE + '.'))
+    return names
+
+
+def code_modules():
+    """CODE_ROOTS 에서 import 를 따라가 닿는 petsinfra 모듈 이름 (정렬)."""
+    found, pending = set(), list(CODE_ROOTS)
+    while pending:
+        name = pending.pop()
+        path = _module_path(name)
+        if name in found or path is None:
+            continue
+        found.add(name)
+        pending.extend(_imports(path))
+    return sorted(found)
+
+
+def code_version():
+    """code_modules 소스, LIBRARIES 버전, SNAPSHOT_SCHEMA 의 해시. 프로세스마다 한 번 계산한다."""
+    global _code_version
+    if _code_version is None:
+        h = hashlib.sha1(f'schema {SNAPSHOT_SCHEMA}\n'.encode())
+        for library in LIBRARIES:
+            h.update(f'{library} {importlib.metadata.version(library)}\n'.encode())
+        for name in code_modules():
+            h.update(f'{name}\n'.encode())
+            h.update(_module_path(name).read_bytes())
+        _code_version = h.hexdigest()
+    return _code_version
+
+
+def version(keys):
+    """그래프 코드 버전과 입력 키 묶음((경로, 내용 해시), ...)의 짧은 버전 문자열. 경로는 쓰지 않는다."""
+    digests = [code_version(), *(digest for _, digest in keys)]
+    return hashlib.sha1('\n'.join(digests).encode()).hexdigest()[:12]
+
+
+def path(name, keys, suffix='.json'):
+    return SNAPSHOT_DIR / f'{name}.{version(keys)}{suffix}'
+
+
+def read(name, keys):
+    """현재 코드와 입력 keys 버전의 스냅샷 JSON 문자열. 없으면(버전이 다르면) None."""
+    try:
+        return path(name, keys).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+
+def write(name, keys, text, page=None):
+    """스냅샷 JSON(과 HTML)을 쓰고 같은 이름의 다른 버전은 지운다. 쓴 JSON 경로를 반환한다."""
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    current = {path(name, keys), path(name, keys, '.html')}
+    for old in SNAPSHOT_DIR.glob(f'{name}.*'):
+        if old not in current:
+            old.unlink()
+    # 실행 중인 앱이 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 바꿔 넣는다
+    if page is not None:
+        with artifacts.replacing(path(name, keys, '.html')) as tmp:
+            tmp.write_text(page, encoding='utf-8')
+    with artifacts.replacing(path(name, keys)) as tmp:
+        tmp.write_text(text, encoding='utf-8')
+    return path(name, keys)
+
+
+def _index(pages):
+    links = ''.join(f'<li><a href="{html.escape(p.name)}">{html.escape(title)}</a></li>' for title, p in pages)
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>EDA 스냅샷</title></head>'
+            f'<body><h1>EDA 스냅샷</h1><p>데이터 버전 {loader.data_version()}</p><ul>{links}</ul></body></html>')
+
+
+def export():
+    """현재 resource/ 입력으로 모든 스냅샷을 만든다. [(이름, JSON 경로)] 를 반환한다."""
+    from petsinfra import figures  # figures 가 이 모듈을 읽으므로 순환 import 를 피한다
+
+    loader.pin()
+    written, pages = [], []
+    for name, inputs, build in figures.snapshot_builders():
+        start = time.perf_counter()
+        keys = figures.input_keys(inputs)
+        text, page = build()
+        written.append((name, write(name, keys, text, page)))
+        if page is not None:
+            pages.append((name, path(name, keys, '.html')))
+        print(f"{name}: {time.perf_counter() - start:.2f}s")
+    with artifacts.replacing(SNAPSHOT_DIR / 'index.html') as tmp:
+        tmp.write_text(_index(pages), encoding='utf-8')
+    return written
+
+
+def main():
+    export()
+    print(f"스냅샷: {SNAPSHOT_DIR}")
+
+
+if __name__ == '__main__':
+    main()
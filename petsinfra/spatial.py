@@ -0,0 +1,87 @@
+"""시설 좌표(위도/경도)를 행정동/자치구 폴리곤에 일괄 할당하는 공간 조인."""
+import numpy as np
+import pandas as pd
+import shapely
+
+
+def assign_points(polygons, lon, lat):
+    """각 점이 속한 폴리곤의 위치(index). 어느 폴리곤에도 속하지 않으면 -1.
+
+    STRtree 로 경계 상자가 겹치는 (점, 폴리곤) 후보 쌍을 한 번에 구한 뒤,
+    prepared 폴리곤에 대해 좌표 배열로 포함 여부를 벡터 연산으로 확인한다.
+    """
+    polygons = np.asarray(polygons)
+    lon = np.asarray(lon, dtype='float64')
+    lat = np.asarray(lat, dtype='float64')
+    shapely.prepare(polygons)
+
+    tree = shapely.STRtree(polygons)
+    point_idx, poly_idx = tree.query(shapely.points(lon, lat))
+    inside = shapely.intersects_xy(polygons[poly_idx], lon[point_idx], lat[point_idx])
+    point_idx, poly_idx = point_idx[inside], poly_idx[inside]
+
+    # 경계선 위의 점은 여러 폴리곤에 걸치므로 (점, 폴리곤) 순으로 정렬해 위치가 가장 앞선 폴리곤으로 정한다
+    order = np.lexsort((poly_idx, point_idx))
+    point_idx, poly_idx = point_idx[order], poly_idx[order]
+    points, first = np.unique(point_idx, return_index=True)
+    result = np.full(len(lon), -1, dtype='int64')
+    result[points] = poly_idx[first]
+    return result
+
+
+def assign_facilities(seoul_gdf, facilities_df):
+    """시설마다 좌표로 찾은 자치구(sggnm)와 행정동(adm_cd, adm_nm).
+
+    seoul_gdf 는 행정동 단위 경계이다. 반환값의 행 순서는 facilities_df 와 같고,
+    경계 밖 좌표는 결측값이 된다.
+    """
+    dong_idx = assign_points(seoul_gdf.geometry.values, facilities_df['경도'], facilities_df['위도'])
+    found = dong_idx >= 0
+    areas = pd.DataFrame(index=facilities_df.index)
+    for column in ['sggnm', 'adm_cd', 'adm_nm']:
+        values = seoul_gdf[column].to_numpy()
+        areas[column] = pd.Categorical(
+            np.where(found, values[np.where(found, dong_idx, 0)], None),
+            categories=sorted(pd.unique(values)),
+        )
+    return areas
+
+
+def district_counts(areas):
+    """자치구별 시설 수 (infra_count.csv 와 같은 형식: 행정구역명, 인프라개수)."""
+    counts = areas['sggnm'].value_counts().sort_index()
+    return pd.DataFrame({'행정구역명': counts.index.astype(str), '인프라개수': counts.to_numpy()})
+
+
+def dong_counts(dongs, areas):
+    """행정동별 시설 수 (시설이 없는 동은 0).
+
+    dongs 는 index 가 adm_cd 이고 sggnm, adm_nm 컬럼을 가진 행정동 표이며, 반환값도 같은
+    index 와 순서를 가진다. '행정동' 컬럼에는 adm_nm 의 마지막 단어(동 이름)를 넣는다.
+    """
+    counts = areas['adm_cd'].value_counts()
+    return pd.DataFrame({
+        'sggnm': dongs['sggnm'],
+        'adm_nm': dongs['adm_nm'],
+        '행정동': dongs['adm_nm'].str.rsplit(' ', n=1).str[-1],
+        '시설수': counts.reindex(dongs.index.astype(str), fill_value=0).to_numpy(),
+    }, index=dongs.index)
+
+
+def count_report(areas, facilities_df, infra_count):
+    """infra_count.csv, 좌표 기반 개수, '시군구 명칭' 기반 개수를 자치구별로 비교한다."""
+    report = pd.DataFrame({
+        'infra_count.csv': infra_count.set_index('행정구역명')['인프라개수'],
+        '좌표': areas['sggnm'].value_counts(),
+        '시군구 명칭': facilities_df['시군구 명칭'].value_counts(),
+    }).fillna(0).astype('int64')
+    report['일치'] = report.nunique(axis=1) == 1
+    return report.rename_axis('자치구')
+
+
+def mismatched_facilities(areas, facilities_df):
+    """'시군구 명칭'과 좌표로 찾은 자치구가 다르거나, 좌표가 서울 경계 밖인 시설."""
+    text_gu = facilities_df['시군구 명칭'].astype(str)
+    point_gu = areas['sggnm'].astype(str).where(areas['sggnm'].notna())
+    mask = point_gu.isna() | (text_gu != point_gu)
+    return facilities_df.loc[mask, ['시설명', '시군구 명칭', '위도', '경도']].assign(좌표_자치구=point_gu[mask])
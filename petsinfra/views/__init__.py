@@ -0,0 +1,11 @@
+"""앱 페이지. 각 모듈의 ``render()`` 가 페이지 하나를 그린다.
+
+streamlt.py 는 선택된 페이지 모듈만 import 하므로, 가벼운 페이지는 plotly/pydeck 같은
+무거운 의존성을 읽지 않는다. (``pages/`` 디렉터리는 Streamlit 이 멀티페이지 앱으로
+인식하므로 이 이름을 쓰지 않는다.)
+"""
+PAGES = {
+    "EDA": "petsinfra.views.eda",
+    "시연": "petsinfra.views.demo",
+    "데이터": "petsinfra.views.data",
+}
@@ -0,0 +1,78 @@
+"""데이터 페이지: 원본/결합 데이터 프레임 확인."""
+import streamlit as st
+
+from petsinfra import loader, profiling, search
+
+# 시설 표 필터: 컬럼 -> 라벨
+FACILITY_FILTERS = {
+    '카테고리2': '중분류',
+    '카테고리3': '소분류',
+    '시군구 명칭': '자치구',
+}
+
+
+@profiling.cache_resource(max_entries=2)
+def _tables(version):
+    population_df = loader.load_population().rename(columns={'동별': '자치구'})
+    pets_df = loader.load_pets().rename(columns={'시군구': '자치구'}).drop(columns="sggnm")
+
+    seoul_gdf_merged = loader.load_merged().drop(columns=["시군구", "행정구역명"])
+    new_order = [
+        "sggnm",  "인구수", "등록수",
+        "인프라개수", "정규화인구", "정규화반려동물", "인프라당반려동물",
+        "geometry", "OBJECTID", "adm_nm", "adm_cd", "adm_cd2", "sgg",
+        "sido", "sidonm",
+    ]
+    # 열 순서 변경
+    seoul_gdf_merged = seoul_gdf_merged[new_order]
+    return population_df, pets_df, seoul_gdf_merged
+
+
+def _first_page():
+    st.session_state['facility_page'] = 1
+
+
+def facility_table():
+    """시설 목록을 검색/필터한 결과 중 현재 페이지만 표시한다."""
+    seoul_infra = loader.load_facilities()
+    facility_search = loader.load_facility_search()
+
+    query = st.text_input('검색 (시설명, 도로명주소, 법정동)', key='facility_query', on_change=_first_page)
+    filters = {
+        column: filter_col.multiselect(label, facility_search.filters[column][0],
+                                       key=f'facility_filter_{column}', on_change=_first_page)
+        for filter_col, (column, label) in zip(st.columns(len(FACILITY_FILTERS)), FACILITY_FILTERS.items())
+    }
+    with profiling.span('search.query'):
+        rows = facility_search.query(query, filters)
+
+    size_col, page_col, info_col = st.columns([1, 1, 2])
+    page_size = size_col.selectbox('페이지 크기', [20, 50, 100], key='facility_page_size', on_change=_first_page)
+    pages = search.page_count(len(rows), page_size)
+    if st.session_state.get('facility_page', 1) > pages:
+        st.session_state['facility_page'] = pages
+    page_number = page_col.number_input('페이지', min_value=1, max_value=pages, key='facility_page')
+    start = (page_number - 1) * page_size
+    info_col.caption(f"전체 {len(seoul_infra):,}곳 중 {len(rows):,}곳 "
+                     f"({min(start + 1, len(rows)):,}–{min(start + page_size, len(rows)):,} 표시)")
+
+    page_df = search.page(seoul_infra, rows, page_number, page_size)
+    with profiling.chart('facility_table', page_df):
+        st.dataframe(page_df)
+
+
+def render():
+    population_df, pets_df, seoul_gdf_merged = _tables(loader.data_version())
+
+    # 인구 데이터 확인
+    st.subheader("인구 데이터 프레임")
+    st.write(population_df)  # 데이터프레임의 상위 5개 행 출력
+    # 반려동물등록 데이터 확인
+    st.subheader("반려동물등록 데이터 프레임")
+    st.write(pets_df)  # 데이터프레임의 상위 5개 행 출력
+    # 구별 인프라 개수 데이터 확인 (검색/필터 결과 중 현재 페이지만 전송)
+    st.subheader("구별 인프라 데이터 프레임")
+    facility_table()
+    # 인구 데이터 확인
+    st.subheader("결합 데이터 프레임")
+    st.write(seoul_gdf_merged)  # 데이터프레임의 상위 5개 행 출력
@@ -0,0 +1,343 @@
+"""시연 페이지: 인프라 분포 및 밀도 분석, 내 주변 시설 찾기."""
+import os
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import pydeck as pdk
+import streamlit as st
+
+from petsinfra import facilities, figures, loader, profiling, raster
+from petsinfra.facility_index import HOVER_FIELDS, MARKER_STYLES
+
+base_color = 'rgb(255, 202, 67)'
+
+# 구를 선택했을 때 시설 마커 표시 방식: 상세는 Plotly 마커마다 hover 정보를 싣고,
+# 경량은 pydeck 에 좌표와 행 위치만 보내고 클릭한 시설의 정보만 따로 보여준다
+MARKER_MODES = ['상세 (hover)', '경량 (클릭 시 상세)']
+# 선택된 구의 시설이 이만큼 이상이면 마커 대신 래스터(PNG) 집계 이미지를 올린다 (petsinfra/raster.py)
+RASTER_MIN_POINTS = max(1, int(os.environ.get('PETSINFRA_RASTER_MIN_POINTS', 5000)))
+
+# 영업 중 필터의 기준 시각 (운영시간은 한국 시간 기준)
+TIMEZONE = ZoneInfo('Asia/Seoul')
+WEEKDAYS = '월화수목금토일'
+
+# 구를 선택했을 때 행정동 색상으로 쓸 지표: 라벨 -> loader.load_dong_aggregates() 컬럼
+DONG_METRICS = {
+    '시설 수': '시설수',
+    '반려동물 천 마리당 시설 수': '반려동물천마리당시설수',
+}
+
+
+def render():
+    # 구별 시설 마커 색인 로드 (캐시 공유)
+    facility_index = loader.load_facility_index()
+
+    # 각 구의 중심 좌표 (index: 구 이름)
+    gu_centers = loader.load_gu_centers()
+
+    # 데이터프레임 생성 - 자치구만 포함
+    gu_names = gu_centers.index.tolist()
+    seoul_info = pd.DataFrame({"gu_name": gu_names})
+
+
+    # 구별 고유한 색상 매핑 생성 (서울은 연두색으로 설정)
+    def generate_colors(n):
+        colors = ['rgb(8,199,180)'] * n  # 서울을 연두색으로 설정
+        return colors
+
+
+    colors = generate_colors(len(gu_names))
+    seoul_info['color'] = colors
+
+
+    def create_map(center_lat=37.563383, center_lon=126.996039, zoom=10, selected_gu=None, dong_metric=None,
+                   open_mask=None, use_raster=False):
+        # 구 선택이 없다면 서울 전체 지도, 구 선택이 있으면 선택된 구 중심에 맞춘 지도
+        if selected_gu is not None:
+            center_lat = gu_centers.loc[selected_gu].center_lat
+            center_lon = gu_centers.loc[selected_gu].center_lon
+            zoom = 11  # 선택된 구에 맞는 줌 레벨 설정
+        else:
+            center_lat = 37.563383  # 서울의 중앙 위도
+            center_lon = 126.996039  # 서울의 중앙 경도
+            zoom = 8  # 서울의 전체 지도를 보여주기 위한 줌 레벨
+
+        # 기본 지도 생성 (구 경계, 줌에 맞게 단순화된 경계 사용)
+        # 구마다 trace 를 만들면 trace 마다 GeoJSON 전체가 실리므로, 하나의 trace 에 구별 색상을 지정
+        fig = go.Figure(go.Choroplethmapbox(
+            geojson=loader.load_seoul_gu_geojson(zoom),
+            locations=seoul_info['gu_name'],
+            z=list(range(len(seoul_info))),
+            colorscale=[[i / max(len(seoul_info) - 1, 1), color] for i, color in enumerate(seoul_info['color'])],
+            showscale=False,
+            marker_opacity=0.8,
+            hovertemplate="%{location}<extra></extra>",
+            name='자치구',
+        ))
+        fig.update_layout(mapbox_style="carto-positron")
+
+        # 선택된 구의 행정동 (동별 집계는 서울 전체를 한 번에 계산해 캐시, 경계는 선택된 구의 것만 전송)
+        if selected_gu is not None and dong_metric is not None:
+            dongs = loader.load_dong_aggregates()
+            column = DONG_METRICS[dong_metric]
+            gu_dongs = dongs[dongs['sggnm'] == selected_gu]
+            fig.add_trace(go.Choroplethmapbox(
+                geojson=loader.load_dong_geojson(selected_gu),
+                locations=gu_dongs.index,
+                z=gu_dongs[column],
+                zmin=0,
+                zmax=dongs[column].max(),  # 서울 전체 기준 색 범위 (다른 구와 비교 가능)
+                colorscale=figures.COLOR_SCALE,
+                reversescale=True,  # 값이 클수록 진한 색
+                marker_opacity=0.8,
+                customdata=gu_dongs[['행정동', '시설수', '반려동물천마리당시설수']],
+                hovertemplate="%{customdata[0]}<br>시설 수: %{customdata[1]}"
+                              "<br>반려동물 천 마리당: %{customdata[2]:.2f}<extra></extra>",
+                colorbar=dict(title=dong_metric, thickness=12),
+                name='행정동',
+            ))
+
+        # 구별 시설 마커 추가 (카테고리별 trace 는 적재 시 미리 만들어 둔 것을 사용, 영업 중 필터가 있으면 골라서 생성)
+        # 시설이 너무 많으면 래스터 이미지 한 장과 범례용 빈 trace 만 올린다
+        if selected_gu is not None and use_raster:
+            facility_raster = rasterize_facilities(selected_gu, open_mask)
+            fig.update_layout(mapbox_layers=[facility_raster.mapbox_layer()])
+            fig.add_traces([
+                go.Scattermapbox(lat=[None], lon=[None], mode='markers', name=category,
+                                 marker=dict(size=10, color=color))
+                for category, color in facility_raster.legend
+            ])
+        elif selected_gu is not None:
+            fig.add_traces([go.Scattermapbox(**trace) for trace in facility_index.traces(selected_gu, open_mask)])
+
+        fig.update_layout(
+            mapbox=dict(
+                center=dict(lat=center_lat, lon=center_lon),
+                zoom=zoom
+            ),
+            margin={"r": 0, "t": 0, "l": 0, "b": 0}
+        )
+
+        return fig
+
+
+    def rasterize_facilities(selected_gu, open_mask=None):
+        # 선택된 구 시설의 래스터 집계 (범례용 (카테고리, 색) 목록을 legend 로 붙여 둔다)
+        with profiling.span('raster.rasterize'):
+            lon, lat, codes, categories = facility_index.coordinates(selected_gu, open_mask)
+            colors = [MARKER_STYLES.get(category, MARKER_STYLES['default'])['color'] for category in categories]
+            facility_raster = raster.rasterize(lon, lat, codes, colors)
+        facility_raster.legend = list(zip(categories, colors))
+        return facility_raster
+
+
+    def create_point_deck(selected_gu, open_mask=None, use_raster=False):
+        # 카테고리마다 ScatterplotLayer 하나 (색은 레이어 상수, 행마다 좌표와 행 위치만 전송)
+        # 시설이 너무 많으면 래스터 이미지 한 장 (BitmapLayer)
+        layers = [
+            pdk.Layer(
+                "GeoJsonLayer",
+                loader.load_dong_geojson(selected_gu),  # 선택된 구의 행정동 경계
+                id='행정동',  # id 를 고정해야 재실행해도 같은 지도로 보고 선택 상태가 유지된다
+                stroked=True,
+                filled=False,
+                get_line_color=[8, 199, 180],
+                line_width_min_pixels=1,
+            ),
+        ]
+        if use_raster:
+            facility_raster = rasterize_facilities(selected_gu, open_mask)
+            layers.append(pdk.Layer(
+                "BitmapLayer",
+                id='시설 래스터',
+                image=facility_raster.image,
+                bounds=list(facility_raster.bounds),
+            ))
+        else:
+            for category, points in facility_index.points(selected_gu, open_mask):
+                color = MARKER_STYLES.get(category, MARKER_STYLES['default'])['color']
+                layers.append(pdk.Layer(
+                    "ScatterplotLayer",
+                    points,
+                    id=category,
+                    get_position="[x, y]",
+                    get_fill_color=[int(color[i:i + 2], 16) for i in (1, 3, 5)],
+                    get_radius=20,
+                    radius_min_pixels=4,
+                    pickable=True,
+                    auto_highlight=True,
+                ))
+        center = gu_centers.loc[selected_gu]
+        return figures.FrozenDeck(pdk.Deck(
+            layers=layers,
+            initial_view_state=pdk.ViewState(latitude=center.center_lat, longitude=center.center_lon, zoom=12),
+            tooltip={"text": "클릭하면 상세 정보"},
+            map_style="light",
+        ))
+
+
+    def show_facility(row):
+        # 클릭한 시설 하나의 상세 정보 (서버에 캐시된 시설 목록에서 행 위치로 꺼낸다)
+        facility = loader.load_facilities(facilities.MAP_COLUMNS).iloc[row]
+        with st.container(border=True):
+            st.markdown(f"**{facility['시설명']}** · {facility['카테고리3']}")
+            st.markdown('  \n'.join(f"{label}: {facility[column]}" for label, column in HOVER_FIELDS
+                                    if pd.notna(facility[column])))
+
+
+    # Streamlit 웹 애플리케이션
+    st.title('서울 반려동물 동반 시설 지도')
+
+    selected_gu = st.selectbox('구 선택', [None] + gu_names)
+    dong_metric = None
+    marker_mode = MARKER_MODES[0]
+    if selected_gu is not None:
+        marker_mode = st.radio('마커 표시', MARKER_MODES, horizontal=True)
+    if marker_mode == MARKER_MODES[0] and selected_gu is not None:
+        dong_view = st.radio('행정동 보기', ['끄기', *DONG_METRICS], horizontal=True)
+        dong_metric = None if dong_view == '끄기' else dong_view
+
+    # 지금 영업 중인 시설만 보기 (지도 마커와 '내 주변 시설 찾기'에 적용)
+    open_mask = None
+    if st.toggle('지금 영업 중인 시설만'):
+        now = datetime.now(TIMEZONE)
+        opening_hours = loader.load_opening_hours()
+        with profiling.span('hours.open_at'):
+            open_mask = opening_hours.open_at(now)
+        st.caption(f"{now:%m월 %d일} ({WEEKDAYS[now.weekday()]}) {now:%H:%M} 기준 영업 중 {open_mask.sum():,}곳 · "
+                   f"운영시간 정보가 없는 {(~opening_hours.known).sum():,}곳은 제외")
+
+    # 지도 출력 (시설 마커를 클릭하면 아래 '내 주변 시설 찾기'의 기준 위치가 된다)
+    marker_count = 0 if selected_gu is None else facility_index.count(selected_gu, open_mask)
+    use_raster = marker_count >= RASTER_MIN_POINTS
+    if marker_mode == MARKER_MODES[0]:
+        with profiling.span('figure.create_map'):
+            map = create_map(selected_gu=selected_gu, dong_metric=dong_metric, open_mask=open_mask,
+                             use_raster=use_raster)
+        with profiling.chart('map', map):
+            map_event = st.plotly_chart(map, use_container_width=True, on_select="rerun", selection_mode="points")
+        clicked = [p for p in map_event.selection.points if 'lat' in p and 'lon' in p]
+    else:
+        with profiling.span('figure.create_point_deck'):
+            point_deck = create_point_deck(selected_gu, open_mask, use_raster)
+        with profiling.chart('point_deck', point_deck):
+            deck_event = st.pydeck_chart(point_deck, use_container_width=True, on_select="rerun",
+                                         selection_mode="single-object", key='point_deck')
+        selected = [p for points in deck_event.selection.objects.values() for p in points]
+        clicked = [{'lat': p['y'], 'lon': p['x']} for p in selected]
+        if selected:
+            with profiling.span('figure.show_facility'):
+                show_facility(selected[0]['i'])
+    if use_raster:
+        st.caption(f"시설 {marker_count:,}곳은 마커 대신 밀도 이미지로 표시합니다. "
+                   "개별 시설은 아래 '내 주변 시설 찾기'에서 확인할 수 있습니다.")
+
+    # 구 선택이 없으면 서울 전체 시설 밀도 (서버에서 육각형 칸으로 집계한 개수만 전송)
+    if selected_gu is None:
+        st.subheader('서울 전체 시설 밀도')
+        facility_categories = loader.load_facilities(['카테고리2', '카테고리3'])
+        bin_col, cat2_col, cat3_col = st.columns([1, 2, 2])
+        bin_size = bin_col.select_slider('칸 크기 (m)', options=[250, 500, 1000, 2000], value=500)
+        density_cat2 = cat2_col.multiselect('중분류', facility_categories['카테고리2'].cat.categories)
+        density_cat3 = cat3_col.multiselect('소분류', facility_categories['카테고리3'].cat.categories)
+        density_bins = loader.load_density(bin_size, density_cat2, density_cat3)
+
+        density_deck = pdk.Deck(
+            layers=[
+                pdk.Layer(
+                    "ColumnLayer",
+                    density_bins,
+                    get_position=["경도", "위도"],
+                    get_fill_color="""
+                        [
+                            (210 + (28 - 210) * 정규화개수), 
+                            (245 + (89 - 245) * 정규화개수), 
+                            (115 + (60 - 115) * 정규화개수)
+                        ]
+                    """,  # 시설 수에 따라 색상 계산
+                    get_elevation="시설수",
+                    elevation_scale=bin_size / 10,  # 칸 크기에 비례하여 높이 설정
+                    radius=bin_size,
+                    disk_resolution=6,  # 육각형 기둥
+                    angle=90,  # 꼭짓점이 위를 향하도록 (집계 격자와 같은 방향)
+                    coverage=0.9,
+                    extruded=True,
+                    auto_highlight=True,
+                    highlight_color=[255, 202, 67, 150],
+                    pickable=True,
+                ),
+            ],
+            initial_view_state=pdk.ViewState(
+                latitude=37.563383,
+                longitude=126.996039,
+                zoom=9.5,
+                pitch=45,
+                bearing=0,
+            ),
+            tooltip={
+                "html": "<b>시설 수:</b> {시설수}",
+                "style": {"backgroundColor": "darkorange", "color": "white"},
+            },
+            map_style="light",
+        )
+        density_deck = figures.FrozenDeck(density_deck)
+        with profiling.chart('density_deck', density_deck):
+            st.pydeck_chart(density_deck)
+
+    # 내 주변 시설 찾기
+    st.subheader('내 주변 시설 찾기')
+    proximity = loader.load_proximity()
+
+    # 지도 선택은 바뀌었을 때만 기준 위치에 반영한다 (선택이 남아 있어도 직접 입력한 좌표를 덮어쓰지 않도록)
+    selection = (float(clicked[0]['lat']), float(clicked[0]['lon'])) if clicked else None
+    if selection is not None and selection != st.session_state.get('near_selection'):
+        st.session_state['near_lat'], st.session_state['near_lon'] = selection
+    st.session_state['near_selection'] = selection
+    if 'near_lat' not in st.session_state:
+        st.session_state['near_lat'] = 37.563383  # 서울의 중앙 위도
+        st.session_state['near_lon'] = 126.996039  # 서울의 중앙 경도
+
+    lat_col, lon_col = st.columns(2)
+    near_lat = lat_col.number_input('위도', key='near_lat', format="%.6f")
+    near_lon = lon_col.number_input('경도', key='near_lon', format="%.6f")
+
+    search_mode = st.radio('검색 방식', ['반경', '가까운 순'], horizontal=True)
+    if search_mode == '반경':
+        radius_m = st.slider('반경 (m)', 100, 3000, 500, step=100)
+        k = None
+    else:
+        radius_m = None
+        k = st.slider('개수', 1, 50, 10)
+    near_categories = st.multiselect('카테고리', proximity.categories)
+
+    with profiling.span('proximity.query'):
+        nearby = proximity.query(near_lat, near_lon, radius_m=radius_m, k=k, categories=near_categories,
+                                 mask=open_mask)
+
+    with profiling.span('figure.near_fig'):
+        near_fig = px.scatter_mapbox(
+            nearby,
+            lat='위도',
+            lon='경도',
+            color='카테고리3',
+            color_discrete_map={c: style['color'] for c, style in MARKER_STYLES.items()},
+            hover_name='시설명',
+            hover_data={'거리(m)': True, '위도': False, '경도': False},
+            mapbox_style="carto-positron",
+        )
+        near_fig.add_scattermapbox(
+            lat=[near_lat], lon=[near_lon], mode='markers', name='기준 위치',
+            marker=dict(size=14, color=base_color),
+        )
+        near_fig.update_layout(
+            mapbox=dict(center=dict(lat=near_lat, lon=near_lon), zoom=13),
+            margin={"r": 0, "t": 0, "l": 0, "b": 0}
+        )
+    with profiling.chart('near_fig', near_fig):
+        st.plotly_chart(near_fig, use_container_width=True)
+    nearby_table = nearby[['시설명', '카테고리3', '도로명주소', '전화번호', '거리(m)']]
+    with profiling.chart('nearby_table', nearby_table):
+        st.dataframe(nearby_table, hide_index=True)
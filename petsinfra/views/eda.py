@@ -0,0 +1,77 @@
+"""EDA 페이지: 인프라 부족 현황과 반려동물 수."""
+import streamlit as st
+
+from petsinfra import figures, profiling
+
+# 접근성 거리 감쇠 폭 (m)
+BANDWIDTHS = [500, 1000, 2000]
+
+
+def render():
+    st.title("EDA")
+    # 그래프와 지도는 데이터 버전마다 한 번만 만들어(스냅샷이 있으면 읽어) 모든 세션이 공유 (petsinfra/figures.py 참고)
+    eda_figures = figures.eda_figures()
+    # 인구수 막대그래프
+    st.subheader("서울 각 구별 인구수")
+    with profiling.chart('population_bar', eda_figures['population_bar']):
+        st.plotly_chart(eda_figures['population_bar'], use_container_width=True)
+    # 7. Streamlit으로 시각화
+    st.subheader("서울 구별 인구 3D 지도")
+    onoff = st.toggle("인구수 3D")
+    # 6. 3D 효과를 위한 Pydeck 지도 설정 (구 선택 시 이름 표시)
+    population_deck = figures.eda_deck('인구수', onoff)
+    with profiling.chart('population_deck', population_deck):
+        st.pydeck_chart(population_deck)
+
+    # 반려동물 등록 시연1 막대그래프
+    st.subheader("서울 각 구별 반려동물 등록 수")
+    with profiling.chart('pets_bar', eda_figures['pets_bar']):
+        st.plotly_chart(eda_figures['pets_bar'], use_container_width=True)
+    st.subheader("서울 반려동물 등록 3D 지도")
+    petonoff = st.toggle("반려동물 3D")
+    pets_deck = figures.eda_deck('반려동물', petonoff)
+    with profiling.chart('pets_deck', pets_deck):
+        st.pydeck_chart(pets_deck)
+
+    # 인프라개수 막대그래프
+    st.subheader("서울 각 구별 인프라 수")
+    with profiling.chart('infra_bar', eda_figures['infra_bar']):
+        st.plotly_chart(eda_figures['infra_bar'], use_container_width=True)
+
+    st.subheader("서울시 반려동물 관련 중분류 분포")
+    with profiling.chart('infra_pie', eda_figures['infra_pie']):
+        st.plotly_chart(eda_figures['infra_pie'])
+
+    # Plotly로 시각화
+    st.subheader("서울시 구별 중분류 분포")
+    with profiling.chart('gu_infra_bar', eda_figures['gu_infra_bar']):
+        st.plotly_chart(eda_figures['gu_infra_bar'])
+    # 등록수 대비 인프라개수 막대그래프
+    st.subheader("등록수 대비 인프라 개수")
+    with profiling.chart('petsbyinfra_bar', eda_figures['petsbyinfra_bar']):
+        st.plotly_chart(eda_figures['petsbyinfra_bar'], use_container_width=True)
+
+    st.subheader("인프라 부족한 지역과 많은 지역 인프라 비교")
+    # Streamlit의 plotly_chart로 차트 표시
+    with profiling.chart('ratio_pies', eda_figures['ratio_pies']):
+        st.plotly_chart(eda_figures['ratio_pies'])
+
+
+    # 격자 기반 접근성: 주변 반려동물 수에 비해 이용할 수 있는 시설 수 (petsinfra/accessibility.py 참고)
+    st.subheader("반려동물 인프라 접근성")
+    default_categories, default_bandwidth = figures.ACCESS_DEFAULT
+    bandwidth_m = st.select_slider("거리 감쇠 (m)", options=BANDWIDTHS, value=default_bandwidth)
+    category_options = figures.accessibility_categories()
+    access_categories = st.multiselect("접근성 카테고리", category_options,
+                                       default=[c for c in default_categories if c in category_options])
+    st.caption("서울 평균을 1 로 한 지수입니다. 빨간 곳은 주변 반려동물 수에 비해 시설이 부족한 곳입니다. "
+               "반려동물 수는 구별 등록수를 구 면적에 고르게 나눠 추정했습니다.")
+    access_fig, underserved = figures.accessibility_view(access_categories, bandwidth_m)
+    with profiling.chart('access_fig', access_fig):
+        st.plotly_chart(access_fig, use_container_width=True)
+
+    st.markdown("**접근성이 가장 낮은 행정동**")
+    with profiling.chart('underserved_table', underserved):
+        st.dataframe(underserved, hide_index=True, use_container_width=True,
+                     column_config={'접근성 지수': st.column_config.NumberColumn(format='%.2f'),
+                                    '추정 반려동물 수': st.column_config.NumberColumn(format='%d')})